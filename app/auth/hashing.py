@@ -0,0 +1,142 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from app.config import settings
+
+_pwd_context = None
+
+def get_pwd_context():
+    # passlib and bcrypt load on first use, keeping them off the worker startup path
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
+
+def __getattr__(name):
+    # ``from app.auth.hashing import pwd_context`` keeps working, lazily
+    if name == "pwd_context":
+        return get_pwd_context()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class HashingPoolFull(Exception):
+    """Raised when the hashing queue is at capacity; callers should shed load."""
+
+# Module-level so they can be pickled into a process pool
+def _hash(password: str) -> str:
+    return get_pwd_context().hash(password)
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, bounded executor so password checks never
+    occupy the event loop or the request threadpool.
+
+    At most ``workers`` hashes run at once and at most ``queue_size`` more
+    wait behind them; anything beyond that is rejected immediately.
+    """
+
+    def __init__(self, workers: int, queue_size: int, kind: str = "thread"):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown hashing executor kind '{kind}'")
+        self.workers = workers
+        self.queue_size = queue_size
+        self.kind = kind
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        # Counters for metrics
+        self.completed = 0
+        self.rejected = 0
+        # Submit-to-result time, queue wait included
+        self.latency_seconds_total = 0.0
+        self.latency_seconds_max = 0.0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.workers, thread_name_prefix="password-hash"
+                        )
+        return self._executor
+
+    def _acquire(self):
+        with self._lock:
+            if self._pending >= self.workers + self.queue_size:
+                self.rejected += 1
+                raise HashingPoolFull()
+            self._pending += 1
+
+    def _run(self, func, *args):
+        # Executes on a pool thread; only used for the thread executor
+        with self._lock:
+            self._running += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    async def _submit(self, func, *args):
+        self._acquire()
+        submitted = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            if self.kind == "process":
+                result = await loop.run_in_executor(self.executor, func, *args)
+            else:
+                result = await loop.run_in_executor(self.executor, self._run, func, *args)
+            elapsed = time.perf_counter() - submitted
+            with self._lock:
+                self.completed += 1
+                self.latency_seconds_total += elapsed
+                self.latency_seconds_max = max(self.latency_seconds_max, elapsed)
+            return result
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(_verify, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        with self._lock:
+            # Process workers can't report back, so assume the pool is saturated first
+            running = self._running if self.kind == "thread" else min(self._pending, self.workers)
+            return {
+                "executor": self.kind,
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "in_flight": self._pending,
+                "queue_depth": self._pending - running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "latency_seconds_total": self.latency_seconds_total,
+                "latency_seconds_max": self.latency_seconds_max,
+                "latency_seconds_avg": self.latency_seconds_total / self.completed if self.completed else 0.0,
+            }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+)
@@ -0,0 +1,52 @@
+import hashlib
+from dataclasses import dataclass
+
+from sqlalchemy import event
+
+from app.auth import models
+from app.cache import TTLCache
+from app.config import settings
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    The authenticated caller as seen by request handlers: just enough of the
+    user row to authorize a request, cheap to cache between requests.
+    """
+    id: int
+    email: str
+    username: str
+    is_active: bool
+    version: str
+
+    @classmethod
+    def from_user(cls, user: models.User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            is_active=bool(user.is_active),
+            version=user_version(user),
+        )
+
+def user_version(user: models.User) -> str:
+    """
+    Short digest of the fields that must revoke issued tokens when they change
+    (active flag, password, email). Stored in the token as the ``ver`` claim.
+    """
+    raw = f"{int(bool(user.is_active))}:{user.hashed_password}:{user.email}"
+    return hashlib.blake2b(raw.encode(), digest_size=6).hexdigest()
+
+principal_cache = TTLCache(
+    maxsize=settings.USER_CACHE_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+
+# Drop cached principals whenever a user row changes through the ORM.
+# This only reaches the current process: other workers, and bulk UPDATE
+# statements that bypass these hooks, keep accepting a revoked token until
+# the entry expires, which is why USER_CACHE_TTL_SECONDS is kept short.
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _invalidate_principal(mapper, connection, target):
+    principal_cache.pop(target.id)
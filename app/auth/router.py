@@ -1,25 +1,50 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database.base import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.base import get_async_db
 from app.auth import models, schemas, utils
+from app.auth.hashing import HashingPoolFull, password_hasher
+from app.auth.principal import principal_cache
 
 router = APIRouter()
 
+def hashing_unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Authentication service is busy, please retry",
+        headers={"Retry-After": "1"},
+    )
+
 @router.post("/register", response_model=schemas.User)
-def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    db_user = utils.get_user_by_email(db, email=user.email)
+async def register(user: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)):
+    db_user = await utils.get_user_by_email(db, email=user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    return utils.create_user(db=db, user=user)
+    try:
+        return await utils.create_user(db=db, user=user)
+    except HashingPoolFull:
+        raise hashing_unavailable()
 
 @router.post("/login", response_model=schemas.Token)
-def login(user: schemas.UserLogin, db: Session = Depends(get_db)):
-    db_user = utils.authenticate_user(db, user.email, user.password)
+async def login(user: schemas.UserLogin, db: AsyncSession = Depends(get_async_db)):
+    try:
+        db_user = await utils.authenticate_user(db, user.email, user.password)
+    except HashingPoolFull:
+        raise hashing_unavailable()
     if not db_user:
         raise HTTPException(
             status_code=401,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = utils.create_access_token(data={"sub": db_user.email})
+    access_token = utils.create_user_token(db_user)
     return {"access_token": access_token, "token_type": "bearer"}
+
+@router.get("/metrics")
+def auth_metrics():
+    """
+    Password hashing pool load and authenticated-user cache hit rate.
+    """
+    return {
+        "password_hashing": password_hasher.stats(),
+        "principal_cache": principal_cache.stats(),
+    }
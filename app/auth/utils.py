@@ -1,26 +1,27 @@
 from datetime import datetime, timedelta
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 
 from app.config import settings
 from app.auth import models, schemas
-from app.database.base import get_db
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.auth.hashing import password_hasher
+from app.auth.principal import Principal, principal_cache, user_version
+from app.database.base import get_async_db
 
 # User operations
-def get_user_by_email(db: Session, email: str):
-    return db.query(models.User).filter(models.User.email == email).first()
+async def get_user_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(models.User).where(models.User.email == email))
+    return result.scalars().first()
 
-def get_user_by_username(db: Session, username: str):
-    return db.query(models.User).filter(models.User.username == username).first()
+async def get_user_by_username(db: AsyncSession, username: str):
+    result = await db.execute(select(models.User).where(models.User.username == username))
+    return result.scalars().first()
 
-def create_user(db: Session, user: schemas.UserCreate):
-    hashed_password = pwd_context.hash(user.password)
+async def create_user(db: AsyncSession, user: schemas.UserCreate):
+    hashed_password = await password_hasher.hash(user.password)
     db_user = models.User(
         email=user.email,
         username=user.username,
@@ -29,34 +30,47 @@ def create_user(db: Session, user: schemas.UserCreate):
         phone_number=user.phone_number
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password, hashed_password):
+    return await password_hasher.verify(plain_password, hashed_password)
 
-def authenticate_user(db: Session, email: str, password: str):
-    user = get_user_by_email(db, email)
+async def authenticate_user(db: AsyncSession, email: str, password: str):
+    user = await get_user_by_email(db, email)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password(password, user.hashed_password):
         return False
     return user
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login", auto_error=False)
 
 def create_access_token(data: dict):
+    # jose pulls in cryptography; import it on first use rather than at startup
+    from jose import jwt
+
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def create_user_token(user: models.User) -> str:
+    return create_access_token(data={
+        "sub": user.email,
+        "uid": user.id,
+        "ver": user_version(user),
+    })
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> models.User:
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    from jose import JWTError, jwt
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -69,8 +83,42 @@ async def get_current_user(
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    
-    user = get_user_by_email(db, email=email)
-    if user is None:
+
+    user_id: Optional[int] = payload.get("uid")
+    if user_id is None:
+        # Tokens issued before uid/ver claims existed
+        user = await get_user_by_email(db, email=email)
+        if user is None:
+            raise credentials_exception
+        return Principal.from_user(user)
+
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        user = await db.get(models.User, user_id)
+        if user is None:
+            raise credentials_exception
+        principal = Principal.from_user(user)
+        principal_cache.set(user_id, principal)
+
+    # Deactivation or a password/email change bumps the version and revokes the token
+    if principal.version != payload.get("ver") or not principal.is_active:
         raise credentials_exception
-    return user
+    return principal
+
+async def get_optional_user(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[Principal]:
+    """
+    Viewer for endpoints that also serve anonymous requests. A missing,
+    expired or revoked token reads as anonymous rather than a 401, so public
+    pages keep working for clients holding a stale token.
+    """
+    if token is None:
+        return None
+    try:
+        return await get_current_user(token=token, db=db)
+    except HTTPException as exc:
+        if exc.status_code != status.HTTP_401_UNAUTHORIZED:
+            raise
+        return None
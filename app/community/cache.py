@@ -0,0 +1,19 @@
+from app.cache import TTLCache
+from app.config import settings
+from .schemas import PostFilter
+
+# Totals for list_posts keyed by the filter, ignoring paging
+post_count_cache = TTLCache(
+    maxsize=settings.COUNT_CACHE_SIZE,
+    ttl=settings.COUNT_CACHE_TTL_SECONDS,
+)
+
+# Whether a user liked a post, keyed by (user_id, post_id); like toggles write through
+liked_cache = TTLCache(
+    maxsize=settings.LIKED_CACHE_SIZE,
+    ttl=settings.LIKED_CACHE_TTL_SECONDS,
+)
+
+def post_count_key(filter_params: PostFilter) -> tuple:
+    fields = filter_params.model_dump(exclude={"page", "page_size", "after", "include_total", "sort", "view"})
+    return tuple(sorted(fields.items()))
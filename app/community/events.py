@@ -0,0 +1,135 @@
+import asyncio
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.config import settings
+from .schemas import PostCounts
+
+class Subscription:
+    """
+    Counts waiting to be sent to one client. Only the latest counts per post
+    are kept, so a slow reader holds at most one pending event per post it
+    watches instead of a growing queue.
+    """
+
+    def __init__(self, post_ids: Iterable[int]):
+        self.post_ids: Set[int] = set(post_ids)
+        self.closed = False
+        self._pending: Dict[int, PostCounts] = {}
+        self._wakeup = asyncio.Event()
+
+    def put(self, counts: PostCounts):
+        self._pending[counts.post_id] = counts
+        self._wakeup.set()
+
+    def close(self):
+        self.closed = True
+        self._wakeup.set()
+
+    async def get(self, timeout: float) -> List[PostCounts]:
+        """Wait up to ``timeout`` seconds for counts; empty on timeout or close."""
+        if not self._pending and not self.closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._wakeup.clear()
+        batch, self._pending = list(self._pending.values()), {}
+        return batch
+
+class CounterHub:
+    """
+    In-process pub/sub for live like and comment counts.
+
+    ``like_post`` and ``create_comment`` publish the new counts; the hub keeps
+    only the latest per post and fans them out to subscribers every
+    ``interval`` seconds, so a post liked hundreds of times a second still
+    emits at most one event per interval. Posts nobody watches are dropped
+    at publish time.
+
+    Events only reach clients connected to the worker that served the write;
+    with several workers, clients still converge on the next event or poll.
+    When the fan-out task isn't running (interval 0, or outside the app
+    lifespan) ``publish`` delivers immediately.
+
+    Everything runs on the event loop, so no locking is needed.
+    """
+
+    def __init__(self, interval: float, max_subscribers: int):
+        self.interval = interval
+        self.max_subscribers = max_subscribers
+        self._dirty: Dict[int, PostCounts] = {}
+        self._by_post: Dict[int, Set[Subscription]] = {}
+        self._subscriptions: Set[Subscription] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self, post_ids: Iterable[int]) -> Optional[Subscription]:
+        """A subscription to ``post_ids``, or None when the hub is full."""
+        if len(self._subscriptions) >= self.max_subscribers:
+            return None
+        subscription = Subscription(post_ids)
+        self._subscriptions.add(subscription)
+        for post_id in subscription.post_ids:
+            self._by_post.setdefault(post_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscriptions.discard(subscription)
+        for post_id in subscription.post_ids:
+            watchers = self._by_post.get(post_id)
+            if watchers is not None:
+                watchers.discard(subscription)
+                if not watchers:
+                    del self._by_post[post_id]
+
+    def publish(self, post_id: int, likes_count: int, comments_count: int):
+        if post_id not in self._by_post:
+            return
+        counts = PostCounts(post_id=post_id, likes_count=likes_count, comments_count=comments_count)
+        if self.running:
+            self._dirty[post_id] = counts
+        else:
+            self._deliver({post_id: counts})
+
+    def flush(self) -> int:
+        batch, self._dirty = self._dirty, {}
+        self._deliver(batch)
+        return len(batch)
+
+    def _deliver(self, batch: Dict[int, PostCounts]):
+        for post_id, counts in batch.items():
+            for subscription in self._by_post.get(post_id, ()):
+                subscription.put(counts)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.flush()
+
+    def start(self):
+        if self.interval > 0 and not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.flush()
+        # End open streams so shutdown doesn't wait on them
+        for subscription in list(self._subscriptions):
+            subscription.close()
+
+counter_hub = CounterHub(
+    interval=settings.EVENTS_COALESCE_SECONDS,
+    max_subscribers=settings.EVENTS_MAX_SUBSCRIBERS,
+)
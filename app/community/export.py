@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Select, select
+
+from app.export import created_since
+from .models import Comment, Post
+
+def posts_export(since: Optional[datetime] = None) -> Select:
+    # likes_count may trail by the like counter's unflushed deltas
+    query = select(
+        Post.id, Post.title, Post.content, Post.type, Post.tags, Post.author_id,
+        Post.likes_count, Post.comments_count, Post.is_hot, Post.created_at, Post.updated_at,
+    )
+    return created_since(query, Post, since)
+
+def comments_export(since: Optional[datetime] = None) -> Select:
+    query = select(Comment.id, Comment.post_id, Comment.author_id, Comment.content, Comment.created_at)
+    return created_since(query, Comment, since)
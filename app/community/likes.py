@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional
+
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database.base import AsyncSessionLocal
+from .models import Comment, Post, PostLike
+
+logger = logging.getLogger(__name__)
+
+async def toggle_like(db: AsyncSession, post_id: int, user_id: int) -> int:
+    """
+    Like or unlike ``post_id`` for ``user_id`` against the unique
+    (post_id, user_id) constraint, without reading the like row first.
+    Returns the change to apply to ``likes_count``: +1, -1, or 0 when a
+    concurrent request by the same user already inserted the like.
+    """
+    result = await db.execute(
+        delete(PostLike).where(PostLike.post_id == post_id, PostLike.user_id == user_id)
+    )
+    if result.rowcount:
+        return -1
+
+    values = {"post_id": post_id, "user_id": user_id}
+    dialect = db.bind.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        stmt = (sqlite_insert if dialect == "sqlite" else postgresql_insert)(PostLike)
+        result = await db.execute(stmt.values(**values).on_conflict_do_nothing())
+        return 1 if result.rowcount else 0
+    try:
+        async with db.begin_nested():
+            await db.execute(insert(PostLike).values(**values))
+        return 1
+    except IntegrityError:
+        return 0
+
+class LikeCounterBuffer:
+    """
+    Write-behind aggregation of ``posts.likes_count``.
+
+    Like toggles add their +1/-1 here and a background task applies the net
+    change per post every ``interval`` seconds in one batched UPDATE, so a
+    post getting hundreds of likes a second costs one row write per interval.
+    Callers add a delta only after the like row it accounts for is committed.
+    Deltas live only in this process until flushed; ``reconcile_counts``
+    repairs any drift left by a crash.
+
+    When the flusher isn't running (interval 0, or outside the app lifespan)
+    ``add`` refuses and callers write through instead.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._pending: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def add(self, post_id: int, delta: int) -> bool:
+        if not self.running:
+            return False
+        with self._lock:
+            self._pending[post_id] = self._pending.get(post_id, 0) + delta
+        return True
+
+    def pending(self, post_id: int) -> int:
+        with self._lock:
+            return self._pending.get(post_id, 0)
+
+    async def flush(self) -> int:
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        batch = {post_id: delta for post_id, delta in batch.items() if delta}
+        if not batch:
+            return 0
+        try:
+            posts = Post.__table__
+            async with AsyncSessionLocal() as db:
+                # One executemany of relative updates for the whole batch
+                await db.execute(
+                    update(posts)
+                    .where(posts.c.id == bindparam("post_id"))
+                    .values(likes_count=posts.c.likes_count + bindparam("delta")),
+                    [{"post_id": post_id, "delta": delta} for post_id, delta in batch.items()],
+                )
+                await db.commit()
+        except Exception:
+            # Put the deltas back so the next flush retries them
+            with self._lock:
+                for post_id, delta in batch.items():
+                    self._pending[post_id] = self._pending.get(post_id, 0) + delta
+            logger.exception("Failed to flush %d like counter deltas", len(batch))
+            return 0
+        return len(batch)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    def start(self):
+        if self.interval > 0 and not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+like_counter = LikeCounterBuffer(interval=settings.LIKE_FLUSH_INTERVAL_SECONDS)
+
+def reconcile_counts(conn: Connection, start_id: int, end_id: int) -> int:
+    """
+    Recompute ``likes_count`` and ``comments_count`` from ``post_likes`` and
+    ``comments`` for posts with ``start_id <= id < end_id``.
+    Returns how many posts were corrected.
+
+    Only safe while no worker holds unflushed like deltas: those are already
+    counted in ``post_likes`` and would be added again when flushed. Run it
+    with the API stopped, or with ``LIKE_FLUSH_INTERVAL_SECONDS=0`` on every
+    worker; in-process callers ``await like_counter.stop()`` first.
+    """
+    likes = select(func.count(PostLike.id)).where(PostLike.post_id == Post.id).scalar_subquery()
+    comments = select(func.count(Comment.id)).where(Comment.post_id == Post.id).scalar_subquery()
+    result = conn.execute(
+        update(Post)
+        .where(Post.id >= start_id, Post.id < end_id)
+        .where((Post.likes_count != likes) | (Post.comments_count != comments))
+        .values(likes_count=likes, comments_count=comments)
+    )
+    return result.rowcount
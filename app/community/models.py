@@ -1,5 +1,5 @@
-from sqlalchemy import Boolean, Column, String, Integer, Text, DateTime, ForeignKey, JSON, Enum, UniqueConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import Boolean, Column, String, Integer, Float, Text, DateTime, ForeignKey, JSON, Enum, UniqueConstraint, Index
+from sqlalchemy.orm import query_expression, relationship
 from datetime import datetime
 import enum
 
@@ -27,7 +27,7 @@ class Post(Base):
     title = Column(String(200), nullable=False)
     content = Column(Text, nullable=False)
     type = Column(Enum(PostType), default=PostType.GENERAL)
-    tags = Column(JSON, default=list)  # Store tags as JSON array
+    tags = Column(JSON, default=list)  # Store tags as JSON array, mirrored in post_tags
     
     author_id = Column(Integer, ForeignKey("users.id"))
     author = relationship("User", backref="posts")
@@ -35,9 +35,17 @@ class Post(Base):
     likes_count = Column(Integer, default=0)
     comments_count = Column(Integer, default=0)
     
-    is_hot = Column(Boolean, default=False)  # For hot topics feature
+    is_hot = Column(Boolean, default=False)  # Set for the top posts by hot_score
+    hot_score = Column(Float, default=0.0, index=True)  # Time-decayed engagement, see ranking.py
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Leading slice of content, only populated by summary queries
+    excerpt = query_expression()
+
+    # Newest-first feed and keyset pagination
+    __table_args__ = (
+        Index("ix_posts_created_at_id", "created_at", "id"),
+    )
 
 class Comment(Base):
     __tablename__ = "comments"
@@ -53,6 +61,12 @@ class Comment(Base):
     
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Per-post comment listing and keyset pagination; time-ordered export
+    __table_args__ = (
+        Index("ix_comments_post_id_created_at_id", "post_id", "created_at", "id"),
+        Index("ix_comments_created_at_id", "created_at", "id"),
+    )
+
 class PostLike(Base):
     __tablename__ = "post_likes"
 
@@ -70,3 +84,29 @@ class PostLike(Base):
     __table_args__ = (
         UniqueConstraint('post_id', 'user_id', name='unique_user_post_like'),
     )
+
+class PostTag(Base):
+    """One row per (post, tag); the indexed side of ``Post.tags`` used for filtering."""
+    __tablename__ = "post_tags"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False)
+    post = relationship("Post", backref="tag_rows")
+
+    tag = Column(String(100), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('post_id', 'tag', name='unique_post_tag'),
+        # Exact-match tag lookups
+        Index("ix_post_tags_tag_post_id", "tag", "post_id"),
+    )
+
+def normalize_tags(tags) -> list:
+    """Stripped, de-duplicated tags in their original order."""
+    seen = []
+    for tag in tags or []:
+        tag = str(tag).strip()
+        if tag and tag not in seen:
+            seen.append(tag)
+    return seen
@@ -0,0 +1,39 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+# Opaque keyset cursors: base64("<created_at ISO>,<id>") of the last row served
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()},{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode().rsplit(",", 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def after_cursor(created_at_column, id_column, cursor: str):
+    """
+    WHERE clause for rows strictly after ``cursor`` in
+    ``ORDER BY created_at DESC, id DESC`` order.
+    """
+    created_at, row_id = decode_cursor(cursor)
+    return or_(
+        created_at_column < created_at,
+        and_(created_at_column == created_at, id_column < row_id),
+    )
+
+def next_cursor(rows: list, page_size: int) -> Optional[str]:
+    # A short page means there is nothing left to fetch
+    if not rows or len(rows) < page_size:
+        return None
+    last = rows[-1]
+    return encode_cursor(last.created_at, last.id)
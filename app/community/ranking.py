@@ -0,0 +1,221 @@
+import asyncio
+import bisect
+import hashlib
+import logging
+import os
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, select, update
+
+from app.config import settings
+from app.database.base import AsyncSessionLocal
+from .cache import post_count_cache
+from .models import Post
+
+try:
+    import fcntl
+except ImportError:  # no flock (Windows): every worker writes
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+def hot_score(
+    likes: int,
+    comments: int,
+    created_at: datetime,
+    now: datetime,
+    gravity: float = settings.HOT_GRAVITY,
+) -> float:
+    """
+    Hacker News style time-decayed score: engagement divided by a power of
+    the post's age in hours. Comments weigh double a like.
+    """
+    points = (likes or 0) + 2 * (comments or 0)
+    age_hours = max(0.0, (now - created_at).total_seconds() / 3600)
+    return points / (age_hours + 2) ** gravity
+
+class HotRanking:
+    """
+    Top ``size`` posts by ``hot_score``, kept sorted in memory so the hot feed
+    is a slice instead of a sort.
+
+    ``refresh`` rebuilds the set from posts created within the window. Every
+    worker keeps its own ranking, but only one writer persists it: it writes
+    ``posts.hot_score`` where the score moved by more than ``tolerance`` and
+    flips ``is_hot`` for the leading ``hot_count`` posts, so SQLite's single
+    write lock isn't taken by every worker each interval. With
+    ``HOT_RANKING_ROLE=auto`` the writer is whichever worker holds a file
+    lock; the others retry it every refresh and take over if it exits.
+
+    Between refreshes ``touch`` re-scores a post whenever it gets a
+    like or comment. All scores are computed against the same reference time
+    (the last refresh), so they stay comparable until the next one.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        window_hours: float,
+        refresh_seconds: float,
+        hot_count: int,
+        tolerance: float = settings.HOT_SCORE_WRITE_TOLERANCE,
+    ):
+        self.size = size
+        self.window = timedelta(hours=window_hours)
+        self.refresh_seconds = refresh_seconds
+        self.hot_count = hot_count
+        self.tolerance = tolerance
+        self.as_of: Optional[datetime] = None
+        self.writer = False
+        # (-score, post_id) ascending, i.e. hottest first
+        self._ranked: List[Tuple[float, int]] = []
+        self._scores: Dict[int, float] = {}
+        self._hot_ids: Optional[Set[int]] = None
+        self._lock_file = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.as_of is not None
+
+    def __len__(self) -> int:
+        return len(self._ranked)
+
+    def ids(self) -> List[int]:
+        """Every ranked post id, hottest first."""
+        return [post_id for _, post_id in self._ranked]
+
+    def touch(self, post_id: int, likes: int, comments: int, created_at: datetime):
+        if not self.ready or created_at < self.as_of - self.window:
+            return
+        score = hot_score(likes, comments, created_at, self.as_of)
+        old = self._scores.pop(post_id, None)
+        if old is not None:
+            del self._ranked[bisect.bisect_left(self._ranked, (-old, post_id))]
+        elif len(self._ranked) >= self.size:
+            if score <= -self._ranked[-1][0]:
+                return
+            _, evicted = self._ranked.pop()
+            del self._scores[evicted]
+        bisect.insort(self._ranked, (-score, post_id))
+        self._scores[post_id] = score
+
+    async def refresh(self, write: bool = True):
+        """Rebuild the ranking; ``write`` also persists scores and ``is_hot``."""
+        now = datetime.utcnow()
+        cutoff = now - self.window
+        posts = Post.__table__
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(posts.c.id, posts.c.likes_count, posts.c.comments_count, posts.c.created_at, posts.c.hot_score)
+                .where(posts.c.created_at >= cutoff)
+            )).all()
+            scored = sorted(
+                (-hot_score(row.likes_count, row.comments_count, row.created_at, now), row.id)
+                for row in rows if row.created_at is not None
+            )
+            hot_ids = [post_id for score, post_id in scored[:self.hot_count] if score < 0]
+            if write:
+                stored = {row.id: row.hot_score or 0.0 for row in rows}
+                await self._persist(db, scored, stored, hot_ids, cutoff)
+
+        self.as_of = now
+        self._ranked = scored[:self.size]
+        self._scores = {post_id: -score for score, post_id in self._ranked}
+        if set(hot_ids) != self._hot_ids:
+            self._hot_ids = set(hot_ids)
+            # Totals for is_hot filters just changed
+            post_count_cache.clear()
+
+    def _moved(self, old: float, new: float) -> bool:
+        return abs(new - old) > self.tolerance * max(abs(old), abs(new))
+
+    async def _persist(self, db, scored: List[Tuple[float, int]], stored: Dict[int, float], hot_ids: List[int], cutoff):
+        posts = Post.__table__
+        # Every score decays between refreshes; write only those that moved noticeably.
+        # Keep updated_at as is: ranking is not an edit to the post.
+        changed = [
+            {"post_id": post_id, "score": -score}
+            for score, post_id in scored if self._moved(stored[post_id], -score)
+        ]
+        if changed:
+            await db.execute(
+                update(posts)
+                .where(posts.c.id == bindparam("post_id"))
+                .values(hot_score=bindparam("score"), updated_at=posts.c.updated_at),
+                changed,
+            )
+        await db.execute(
+            update(posts)
+            .where(posts.c.hot_score > 0, posts.c.created_at < cutoff)
+            .values(hot_score=0, updated_at=posts.c.updated_at)
+        )
+        await db.execute(
+            update(posts)
+            .where(posts.c.is_hot.is_(True), posts.c.id.notin_(hot_ids))
+            .values(is_hot=False, updated_at=posts.c.updated_at)
+        )
+        await db.execute(
+            update(posts)
+            .where(posts.c.is_hot.is_(False), posts.c.id.in_(hot_ids))
+            .values(is_hot=True, updated_at=posts.c.updated_at)
+        )
+        await db.commit()
+
+    def _acquire_writer(self) -> bool:
+        if settings.HOT_RANKING_ROLE != "auto":
+            return settings.HOT_RANKING_ROLE == "writer"
+        if fcntl is None:
+            return True
+        path = settings.HOT_RANKING_LOCK_FILE or os.path.join(
+            tempfile.gettempdir(),
+            "bumpcore-hot-ranking-{}.lock".format(hashlib.sha1(settings.DATABASE_URL.encode()).hexdigest()[:12]),
+        )
+        lock_file = open(path, "a")
+        try:
+            # Held for the life of the process; released by the OS if it dies
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def _release_writer(self):
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+        self.writer = False
+
+    async def _run(self):
+        while True:
+            try:
+                if not self.writer:
+                    self.writer = self._acquire_writer()
+                await self.refresh(write=self.writer)
+            except Exception:
+                logger.exception("Hot ranking refresh failed")
+            await asyncio.sleep(self.refresh_seconds)
+
+    def start(self):
+        if self.refresh_seconds > 0 and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._release_writer()
+
+hot_ranking = HotRanking(
+    size=settings.HOT_RANKING_SIZE,
+    window_hours=settings.HOT_WINDOW_HOURS,
+    refresh_seconds=settings.HOT_REFRESH_SECONDS,
+    hot_count=settings.HOT_POSTS_COUNT,
+)
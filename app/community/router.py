@@ -1,142 +1,508 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, or_, func
-from typing import List, Optional
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, load_only, with_expression
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import desc, insert, select, func, update
+from typing import AsyncIterator, Dict, List, Optional, Union
+from pydantic import TypeAdapter
 from datetime import datetime
 
-from app.database.base import get_db
-from app.auth.utils import get_current_user
+from app.config import settings
+from app.database.base import AsyncSessionLocal, get_async_db
+from app.export import ExportFormat, export_response
+from .export import comments_export, posts_export
+from app.metrics import query_budget
+from app.params import parse_ids
+from app.responses import FastJSONResponse
 from app.auth.models import User
-from .models import Post, Comment, PostLike, PostType
+from app.auth.utils import get_current_user, get_optional_user
+from app.auth.principal import Principal
+from .models import Post, Comment, PostLike, PostTag, PostType, normalize_tags
+from .cache import liked_cache, post_count_cache, post_count_key
+from .events import Subscription, counter_hub
+from .likes import like_counter, toggle_like
+from .ranking import hot_ranking
+from .pagination import after_cursor, next_cursor
 from .schemas import (
-    PostCreate, PostResponse, PostList, CommentCreate, 
-    CommentResponse, LikeResponse, PostFilter
+    PostCreate, PostResponse, PostList, PostSummaryList, PostBatch, PostSummaryBatch, CommentCreate,
+    CommentResponse, LikeResponse, PostCounts, PostFilter, PostSort, PostView
 )
 
 router = APIRouter(prefix="/community", tags=["社区"])
 
+_comment_list = TypeAdapter(List[CommentResponse])
+
+def _add_pending_likes(posts: List[Post]):
+    """Count the likes still buffered in ``like_counter`` into each post's ``likes_count``."""
+    for post in posts:
+        # Without marking the post dirty: the stored counter is the flusher's to update
+        set_committed_value(post, "likes_count", post.likes_count + like_counter.pending(post.id))
+
+async def _get_post_with_author(db: AsyncSession, post_id: int) -> Optional[Post]:
+    result = await db.execute(
+        select(Post).join(Post.author).options(joinedload(Post.author)).where(Post.id == post_id)
+    )
+    post = result.scalars().first()
+    if post is not None:
+        _add_pending_likes([post])
+    return post
+
+def _list_options(view: PostView) -> tuple:
+    if view == PostView.FULL:
+        return (joinedload(Post.author),)
+    # Summary rows skip content (and the author's private columns) entirely
+    return (
+        load_only(
+            Post.id, Post.title, Post.type, Post.tags, Post.author_id,
+            Post.likes_count, Post.comments_count, Post.is_hot, Post.created_at,
+        ),
+        with_expression(Post.excerpt, func.substr(Post.content, 1, settings.EXCERPT_LENGTH)),
+        joinedload(Post.author).load_only(User.id, User.username),
+    )
+
+async def _load_posts(db: AsyncSession, post_ids: List[int], view: PostView = PostView.FULL) -> Dict[int, Post]:
+    """Posts with authors in one IN query, keyed by id."""
+    if not post_ids:
+        return {}
+    result = await db.execute(
+        select(Post).options(*_list_options(view)).where(Post.id.in_(set(post_ids)))
+    )
+    posts = result.scalars().unique().all()
+    _add_pending_likes(posts)
+    return {post.id: post for post in posts}
+
+async def _get_posts_by_ids(db: AsyncSession, post_ids: List[int], view: PostView = PostView.FULL) -> List[Post]:
+    """Like ``_load_posts``, as a list in ``post_ids`` order without the missing ones."""
+    by_id = await _load_posts(db, post_ids, view)
+    return [by_id[post_id] for post_id in post_ids if post_id in by_id]
+
+async def _annotate_liked(db: AsyncSession, posts: List[Post], viewer: Optional[Principal]):
+    """Set ``liked_by_me`` on ``posts`` for ``viewer`` with at most one IN query on post_likes."""
+    if viewer is None or not posts:
+        return
+    liked: Dict[int, bool] = {}
+    for post in posts:
+        cached = liked_cache.get((viewer.id, post.id))
+        if cached is not None:
+            liked[post.id] = cached
+    missing = {post.id for post in posts} - liked.keys()
+    if missing:
+        # Served by the (post_id, user_id) unique index
+        found = set(await db.scalars(
+            select(PostLike.post_id).where(PostLike.user_id == viewer.id, PostLike.post_id.in_(missing))
+        ))
+        for post_id in missing:
+            liked[post_id] = post_id in found
+            liked_cache.set((viewer.id, post_id), liked[post_id])
+    for post in posts:
+        # Transient attribute picked up by the response schema
+        post.liked_by_me = liked[post.id]
+
+def _parse_include(
+    include: Optional[str] = Query(None, description="recent_comments[:N] embeds each post's latest N comments"),
+) -> int:
+    """Comments per post requested through ``include``; 0 when none."""
+    recent_comments = 0
+    for item in filter(None, (part.strip() for part in (include or "").split(","))):
+        name, _, count = item.partition(":")
+        if name != "recent_comments":
+            raise HTTPException(status_code=400, detail=f"Unknown include: {name}")
+        try:
+            recent_comments = int(count) if count else settings.RECENT_COMMENTS_DEFAULT
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid recent_comments count")
+        if not 0 < recent_comments <= settings.RECENT_COMMENTS_MAX:
+            raise HTTPException(
+                status_code=400, detail=f"recent_comments must be between 1 and {settings.RECENT_COMMENTS_MAX}"
+            )
+    return recent_comments
+
+async def _attach_recent_comments(db: AsyncSession, posts: List[Post], limit: int):
+    """Set ``recent_comments`` on ``posts`` to their latest ``limit`` comments, in one windowed query."""
+    if not limit or not posts:
+        return
+    rank = func.row_number().over(
+        partition_by=Comment.post_id,
+        order_by=(desc(Comment.created_at), desc(Comment.id)),
+    ).label("rank")
+    # Walks ix_comments_post_id_created_at_id for the page's posts only
+    ranked = select(Comment.id, rank).where(Comment.post_id.in_({post.id for post in posts})).subquery()
+    result = await db.execute(
+        select(Comment)
+        .join(ranked, ranked.c.id == Comment.id)
+        .options(joinedload(Comment.author).load_only(User.id, User.username))
+        .where(ranked.c.rank <= limit)
+        .order_by(Comment.post_id, desc(Comment.created_at), desc(Comment.id))
+    )
+    by_post: Dict[int, List[Comment]] = {}
+    for comment in result.scalars():
+        by_post.setdefault(comment.post_id, []).append(comment)
+    for post in posts:
+        # Transient attribute, like liked_by_me; Post.comments stays unloaded
+        post.recent_comments = by_post.get(post.id, [])
+
+async def _add_likes(db: AsyncSession, post_id: int, delta: int):
+    await db.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(likes_count=Post.likes_count + delta)
+    )
+
+async def _touch_hot_ranking(db: AsyncSession, post_id: int):
+    row = (await db.execute(
+        select(Post.likes_count, Post.comments_count, Post.created_at).where(Post.id == post_id)
+    )).first()
+    if row is not None:
+        hot_ranking.touch(
+            post_id, row.likes_count + like_counter.pending(post_id), row.comments_count, row.created_at
+        )
+    return row
+
+async def _event_stream(subscription: Subscription, initial: List[PostCounts]) -> AsyncIterator[str]:
+    try:
+        batch = initial
+        while True:
+            for counts in batch:
+                yield f"event: counts\ndata: {counts.model_dump_json()}\n\n"
+            if subscription.closed:
+                break
+            batch = await subscription.get(settings.EVENTS_KEEPALIVE_SECONDS)
+            if not batch:
+                # Comment line, keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+    finally:
+        # Also runs when the client disconnects and the generator is cancelled
+        counter_hub.unsubscribe(subscription)
+
+async def _subscribe_counts(post_ids: List[int]) -> StreamingResponse:
+    # Subscribe before reading the snapshot so no change falls in between
+    subscription = counter_hub.subscribe(post_ids)
+    if subscription is None:
+        raise HTTPException(status_code=503, detail="Too many event subscribers")
+    try:
+        # A short-lived session: the stream may stay open for hours
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(Post.id, Post.likes_count, Post.comments_count).where(Post.id.in_(set(post_ids)))
+            )).all()
+    except BaseException:
+        counter_hub.unsubscribe(subscription)
+        raise
+    initial = [
+        PostCounts(
+            post_id=row.id,
+            likes_count=row.likes_count + like_counter.pending(row.id),
+            comments_count=row.comments_count,
+        )
+        for row in rows
+    ]
+    if not initial:
+        counter_hub.unsubscribe(subscription)
+        raise HTTPException(status_code=404, detail="Post not found")
+    return StreamingResponse(
+        _event_stream(subscription, initial),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# Principal lookup on a cache miss, post INSERT, one tag executemany, reload
 @router.post("/posts", response_model=PostResponse)
+@query_budget(4)
 async def create_post(
     post: PostCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
+    tags = normalize_tags(post.tags)
     db_post = Post(
-        **post.model_dump(),
+        **post.model_dump(exclude={"tags"}),
+        tags=tags,
         author_id=current_user.id
     )
     db.add(db_post)
-    db.commit()
-    db.refresh(db_post)
-    return db_post
+    await db.flush()
+    if tags:
+        # One executemany for all tags, however many there are
+        await db.execute(insert(PostTag), [{"post_id": db_post.id, "tag": tag} for tag in tags])
+    # Reload with the author eagerly (lazy loads are not allowed on AsyncSession)
+    # before committing, so every statement runs, and is budgeted, inside the transaction
+    created = await _get_post_with_author(db, db_post.id)
+    await db.commit()
+    post_count_cache.clear()
+    # No engagement yet; ranked now so the hot feed doesn't wait for the next refresh
+    hot_ranking.touch(created.id, 0, 0, created.created_at)
+    return created
+
+async def query_posts(
+    db: AsyncSession,
+    filter_params: PostFilter,
+    viewer: Optional[Principal] = None,
+    recent_comments: int = 0,
+) -> Union[PostList, PostSummaryList]:
+    """
+    One page of posts for ``filter_params``, as the model for its ``view``,
+    with each post's latest ``recent_comments`` comments embedded.
+    """
+    query = select(Post).outerjoin(Post.author)
 
-@router.get("/posts", response_model=PostList)
-async def list_posts(
-    db: Session = Depends(get_db),
-    filter_params: PostFilter = Depends(),
-):
-    query = db.query(Post).outerjoin(Post.author).options(joinedload(Post.author))
-    
     # Apply filters
     if filter_params.type:
-        query = query.filter(Post.type == filter_params.type)
+        query = query.where(Post.type == filter_params.type)
     if filter_params.is_hot is not None:
-        query = query.filter(Post.is_hot == filter_params.is_hot)
+        query = query.where(Post.is_hot == filter_params.is_hot)
     if filter_params.author_id:
-        query = query.filter(Post.author_id == filter_params.author_id)
+        query = query.where(Post.author_id == filter_params.author_id)
     if filter_params.tag:
-        # Handle JSON string tags from SQLite
-        query = query.filter(Post.tags.like(f'%{filter_params.tag}%'))
-    
-    # Get total count
-    total = query.count()
-    
-    # Apply pagination
-    posts = query.order_by(desc(Post.created_at))\
-        .offset((filter_params.page - 1) * filter_params.page_size)\
-        .limit(filter_params.page_size)\
-        .all()
-    
-    return PostList(total=total, posts=posts)
+        # Exact match through the indexed post_tags table
+        query = query.join(PostTag, PostTag.post_id == Post.id)\
+            .where(PostTag.tag == filter_params.tag.strip())
+
+    # The unfiltered hot feed starts from the in-memory ranking
+    unfiltered = not (filter_params.type or filter_params.is_hot is not None
+                      or filter_params.author_id or filter_params.tag)
+    from_ranking = filter_params.sort == PostSort.HOT and unfiltered and hot_ranking.ready
+
+    # Get total count, served from the count cache when possible
+    total = None
+    if filter_params.include_total:
+        key = post_count_key(filter_params)
+        total = post_count_cache.get(key)
+        if total is None:
+            total = await db.scalar(select(func.count()).select_from(query.subquery()))
+            post_count_cache.set(key, total)
+
+    # Options only shape the loaded columns, so add them after the count
+    query = query.options(*_list_options(filter_params.view))
+    response_model = PostSummaryList if filter_params.view == PostView.SUMMARY else PostList
+
+    offset = (filter_params.page - 1) * filter_params.page_size
+    if filter_params.sort == PostSort.HOT:
+        ranked = hot_ranking.ids() if from_ranking else []
+        page_ids = ranked[offset:offset + filter_params.page_size]
+        posts = await _get_posts_by_ids(db, page_ids, filter_params.view) if page_ids else []
+        remaining = filter_params.page_size - len(page_ids)
+        if remaining > 0:
+            # Past the end of the ranking (posts outside the window, or the whole feed
+            # when filtered) order by the persisted hot_score. Skipping every ranked id
+            # keeps the seam free of repeats and gaps.
+            if ranked:
+                query = query.where(Post.id.notin_(ranked))
+            result = await db.execute(
+                query.order_by(desc(Post.hot_score), desc(Post.id))
+                .offset(max(0, offset - len(ranked)))
+                .limit(remaining)
+            )
+            rest = result.scalars().all()
+            _add_pending_likes(rest)
+            posts = [*posts, *rest]
+        await _annotate_liked(db, posts, viewer)
+        await _attach_recent_comments(db, posts, recent_comments)
+        return response_model.model_validate({"total": total, "posts": posts}, from_attributes=True)
+
+    # Apply pagination: keyset when a cursor is given, offset otherwise
+    query = query.order_by(desc(Post.created_at), desc(Post.id))
+    if filter_params.after:
+        query = query.where(after_cursor(Post.created_at, Post.id, filter_params.after))
+    else:
+        query = query.offset(offset)
+    result = await db.execute(query.limit(filter_params.page_size))
+    posts = result.scalars().all()
+    _add_pending_likes(posts)
+    await _annotate_liked(db, posts, viewer)
+    await _attach_recent_comments(db, posts, recent_comments)
+
+    return response_model.model_validate({
+        "total": total,
+        "posts": posts,
+        "next_cursor": next_cursor(posts, filter_params.page_size),
+    }, from_attributes=True)
+
+# Principal, COUNT, ranked and unranked halves of a hot page, liked_by_me, recent comments
+@router.get("/posts", response_model=Union[PostList, PostSummaryList])
+@query_budget(6)
+async def list_posts(
+    db: AsyncSession = Depends(get_async_db),
+    filter_params: PostFilter = Depends(),
+    viewer: Optional[Principal] = Depends(get_optional_user),
+    recent_comments: int = Depends(_parse_include),
+):
+    # Serialized straight from the model; response_model only documents the shape
+    return FastJSONResponse(await query_posts(db, filter_params, viewer, recent_comments))
+
+# Declared before /posts/{post_id} so "export" isn't parsed as an id
+@router.get("/posts/export", response_class=StreamingResponse)
+@query_budget(1)
+async def export_posts(
+    fmt: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    since: Optional[datetime] = Query(None, description="Only posts created at or after this time"),
+):
+    """
+    Every post as NDJSON or CSV, oldest first, streamed through a server-side
+    cursor. Pass the last ``created_at`` seen as ``since`` for incremental pulls.
+    """
+    return export_response(posts_export(since), "posts", fmt)
+
+@router.get("/comments/export", response_class=StreamingResponse)
+@query_budget(1)
+async def export_comments(
+    fmt: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    since: Optional[datetime] = Query(None, description="Only comments created at or after this time"),
+):
+    """Every comment as NDJSON or CSV, oldest first; see ``export_posts``."""
+    return export_response(comments_export(since), "comments", fmt)
+
+# Declared before /posts/{post_id} so "events" isn't parsed as an id
+@router.get("/posts/events", response_class=StreamingResponse)
+@query_budget(1)
+async def stream_feed_counts(ids: List[int] = Depends(parse_ids)):
+    """
+    Server-Sent Events with the like and comment counts of the posts on a
+    feed page. Sends the current counts, then a ``counts`` event whenever
+    they change, at most one per post per coalescing window.
+    """
+    return await _subscribe_counts(ids)
+
+# Declared before /posts/{post_id} so "batch" isn't parsed as an id
+@router.get("/posts/batch", response_model=Union[PostBatch, PostSummaryBatch])
+@query_budget(3)
+async def get_posts_batch(
+    ids: List[int] = Depends(parse_ids),
+    view: PostView = PostView.FULL,
+    viewer: Optional[Principal] = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Several posts in one round trip, in the order of ``ids``.
+    Missing posts come back as null and are listed in ``not_found``.
+    """
+    by_id = await _load_posts(db, ids, view)
+    await _annotate_liked(db, list(by_id.values()), viewer)
+    response_model = PostSummaryBatch if view == PostView.SUMMARY else PostBatch
+    return FastJSONResponse(response_model.model_validate({
+        "posts": [by_id.get(post_id) for post_id in ids],
+        "not_found": [post_id for post_id in ids if post_id not in by_id],
+    }, from_attributes=True))
 
 @router.get("/posts/{post_id}", response_model=PostResponse)
+@query_budget(4)
 async def get_post(
     post_id: int,
-    db: Session = Depends(get_db)
+    viewer: Optional[Principal] = Depends(get_optional_user),
+    recent_comments: int = Depends(_parse_include),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    post = db.query(Post).join(Post.author).options(joinedload(Post.author)).filter(Post.id == post_id).first()
+    post = await _get_post_with_author(db, post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    return post
+    await _annotate_liked(db, [post], viewer)
+    await _attach_recent_comments(db, [post], recent_comments)
+    return FastJSONResponse(PostResponse.model_validate(post))
+
+@router.get("/posts/{post_id}/events", response_class=StreamingResponse)
+@query_budget(1)
+async def stream_post_counts(post_id: int):
+    """Server-Sent Events with the like and comment counts of one post; replaces polling the post."""
+    return await _subscribe_counts([post_id])
 
 @router.post("/posts/{post_id}/like", response_model=LikeResponse)
+@query_budget(6)
 async def like_post(
     post_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post:
+    if await db.scalar(select(Post.id).where(Post.id == post_id)) is None:
         raise HTTPException(status_code=404, detail="Post not found")
-    
-    existing_like = db.query(PostLike).filter(
-        PostLike.post_id == post_id,
-        PostLike.user_id == current_user.id
-    ).first()
-    
-    if existing_like:
-        # Unlike if already liked
-        db.delete(existing_like)
-        post.likes_count -= 1
-    else:
-        # Add new like
-        like = PostLike(post_id=post_id, user_id=current_user.id)
-        db.add(like)
-        post.likes_count += 1
-    
-    db.commit()
+
+    delta = await toggle_like(db, post_id, current_user.id)
+    # Buffer the counter change when write-behind is on, else update it atomically
+    write_through = bool(delta) and not like_counter.running
+    if write_through:
+        await _add_likes(db, post_id, delta)
+    await db.commit()
+    # Only buffered once the like row is committed, so a failed commit leaves no delta behind
+    if delta and not write_through and not like_counter.add(post_id, delta):
+        # The flusher stopped in between (shutdown): write through after all
+        await _add_likes(db, post_id, delta)
+        await db.commit()
+    # -1 is an unlike; 0 means a concurrent request by this user already liked it
+    liked = delta >= 0
+    liked_cache.set((current_user.id, post_id), liked)
+
+    row = await _touch_hot_ranking(db, post_id)
+    if row is None:
+        # Deleted while the like was being recorded
+        raise HTTPException(status_code=404, detail="Post not found")
+    likes_count = row.likes_count + like_counter.pending(post_id)
+    if delta:
+        counter_hub.publish(post_id, likes_count, row.comments_count)
     return LikeResponse(
         success=True,
-        likes_count=post.likes_count
+        likes_count=likes_count,
+        liked=liked
     )
 
 @router.post("/posts/{post_id}/comments", response_model=CommentResponse)
+@query_budget(6)
 async def create_comment(
     post_id: int,
     comment: CommentCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post:
+    if await db.scalar(select(Post.id).where(Post.id == post_id)) is None:
         raise HTTPException(status_code=404, detail="Post not found")
-    
+
+    # The path parameter is authoritative for the target post
     db_comment = Comment(
-        **comment.model_dump(),
+        **comment.model_dump(exclude={"post_id"}),
         author_id=current_user.id,
         post_id=post_id
     )
-    post.comments_count += 1
-    
     db.add(db_comment)
-    db.commit()
-    db.refresh(db_comment)
-    return db_comment
+    await db.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(comments_count=Post.comments_count + 1)
+    )
+    await db.commit()
+    row = await _touch_hot_ranking(db, post_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+    counter_hub.publish(post_id, row.likes_count + like_counter.pending(post_id), row.comments_count)
+    result = await db.execute(
+        select(Comment).options(joinedload(Comment.author)).where(Comment.id == db_comment.id)
+    )
+    return result.scalars().one()
 
 @router.get("/posts/{post_id}/comments", response_model=List[CommentResponse])
+@query_budget(1)
 async def list_comments(
     post_id: int,
-    page: int = Query(1, gt=0),
-    page_size: int = Query(20, gt=0),
-    db: Session = Depends(get_db)
+    page: int = 1,
+    page_size: int = Query(20, description=f"Clamped to 1..{settings.MAX_PAGE_SIZE}"),
+    after: Optional[str] = Query(None, description="Keyset cursor from the X-Next-Cursor header"),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    comments = db.query(Comment)\
+    # Clamped like PostFilter rather than rejected
+    page, page_size = max(1, page), max(1, min(page_size, settings.MAX_PAGE_SIZE))
+    query = select(Comment)\
         .join(Comment.author)\
         .options(joinedload(Comment.author))\
-        .filter(Comment.post_id == post_id)\
-        .order_by(desc(Comment.created_at))\
-        .offset((page - 1) * page_size)\
-        .limit(page_size)\
-        .all()
-    
-    return comments
+        .where(Comment.post_id == post_id)\
+        .order_by(desc(Comment.created_at), desc(Comment.id))
+    if after:
+        query = query.where(after_cursor(Comment.created_at, Comment.id, after))
+    else:
+        query = query.offset((page - 1) * page_size)
+    result = await db.execute(query.limit(page_size))
+    comments = result.scalars().all()
+
+    # The body stays a plain list for existing clients; the cursor rides in a header
+    body = _comment_list.dump_json(_comment_list.validate_python(comments, from_attributes=True))
+    response = FastJSONResponse(body)
+    cursor = next_cursor(comments, page_size)
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+    return response
@@ -1,8 +1,18 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator
 from typing import List, Optional
 from datetime import datetime
+from enum import Enum
+from app.config import settings
 from .models import PostType
 
+class PostSort(str, Enum):
+    LATEST = "latest"
+    HOT = "hot"
+
+class PostView(str, Enum):
+    FULL = "full"
+    SUMMARY = "summary"
+
 class UserBase(BaseModel):
     username: str
     
@@ -39,15 +49,59 @@ class PostResponse(PostBase):
     is_hot: bool
     created_at: datetime
     updated_at: datetime
+    # Whether the authenticated viewer liked the post; null for anonymous requests
+    liked_by_me: Optional[bool] = None
+    # Latest comments, newest first; only set with include=recent_comments:N
+    recent_comments: Optional[List[CommentResponse]] = None
     model_config = ConfigDict(from_attributes=True)
 
 class PostList(BaseModel):
-    total: int
+    # None when the request opted out with include_total=false
+    total: Optional[int] = None
     posts: List[PostResponse]
+    # Pass back as ``after`` to fetch the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+class PostSummary(BaseModel):
+    id: int
+    title: str
+    excerpt: Optional[str] = None
+    type: PostType
+    tags: List[str] = []
+    author: UserInfo
+    likes_count: int
+    comments_count: int
+    is_hot: bool
+    created_at: datetime
+    liked_by_me: Optional[bool] = None
+    recent_comments: Optional[List[CommentResponse]] = None
+    model_config = ConfigDict(from_attributes=True)
+
+class PostSummaryList(BaseModel):
+    total: Optional[int] = None
+    posts: List[PostSummary]
+    next_cursor: Optional[str] = None
+
+class PostBatch(BaseModel):
+    # Aligned with the requested ids; null where the post doesn't exist
+    posts: List[Optional[PostResponse]]
+    not_found: List[int]
+
+class PostSummaryBatch(BaseModel):
+    posts: List[Optional[PostSummary]]
+    not_found: List[int]
 
 class LikeResponse(BaseModel):
     success: bool
     likes_count: int
+    # State after the toggle
+    liked: Optional[bool] = None
+
+# Payload of the live counter events
+class PostCounts(BaseModel):
+    post_id: int
+    likes_count: int
+    comments_count: int
 
 # For filtering posts
 class PostFilter(BaseModel):
@@ -57,3 +111,24 @@ class PostFilter(BaseModel):
     tag: Optional[str] = None
     page: int = 1
     page_size: int = 20
+    # ``hot`` ranks by hot_score; cursors only apply to ``latest``
+    sort: PostSort = PostSort.LATEST
+    # Keyset cursor from a previous ``next_cursor``; takes precedence over ``page``
+    after: Optional[str] = None
+    # Skip counting matching posts; ``total`` comes back as null
+    include_total: bool = True
+    # ``summary`` drops content in favour of a short excerpt
+    view: PostView = PostView.FULL
+
+    # Clamped rather than rejected: a validation error raised while building
+    # a Depends() model surfaces as a 500, not a 422. The lower bounds matter
+    # too: SQLite reads LIMIT -1 as no limit, and page 0 is a negative offset.
+    @field_validator("page_size")
+    @classmethod
+    def clamp_page_size(cls, value: int) -> int:
+        return max(1, min(value, settings.MAX_PAGE_SIZE))
+
+    @field_validator("page")
+    @classmethod
+    def clamp_page(cls, value: int) -> int:
+        return max(1, value)
@@ -12,6 +12,82 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7天
     # 数据库连接
     DATABASE_URL: str = "sqlite:///./bumpbuddy.db"
+    # 异步数据库连接，留空则根据 DATABASE_URL 推导（如 sqlite+aiosqlite）
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # SQLite 连接参数（每个连接建立时设置 PRAGMA）
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    # 负数表示 KiB，-65536 即 64MB 页缓存
+    SQLITE_CACHE_SIZE: int = -65536
+    # 服务器数据库（PostgreSQL/MySQL）连接池
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800
+    # 启动时自动建表（开发环境方便）；生产环境建议设为 false，部署时运行 scripts/init_db.py
+    DB_CREATE_SCHEMA_ON_STARTUP: bool = True
+    # 密码哈希线程池/进程池（thread 或 process）
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    # 排队上限，超出时直接返回 503
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+    # 已认证用户缓存（按用户 ID），修改或停用用户时失效；
+    # 失效只作用于当前进程，其他 worker（及批量 UPDATE）最多要等 TTL 秒才会拒绝已吊销的令牌
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 30
+    # 列表总数缓存（帖子、健康文章），写入时失效
+    COUNT_CACHE_SIZE: int = 1024
+    COUNT_CACHE_TTL_SECONDS: int = 30
+    # 当前用户是否点过赞（liked_by_me）的缓存，按 (用户, 帖子) 存储，点赞/取消时更新
+    LIKED_CACHE_SIZE: int = 100000
+    LIKED_CACHE_TTL_SECONDS: int = 30
+    # 健康文章全文检索：auto（SQLite 用 fts5，其他数据库用 like）、fts5、like
+    SEARCH_BACKEND: str = "auto"
+    # 列表接口单页最大条数（帖子、评论、健康文章）；全量数据请使用导出接口
+    MAX_PAGE_SIZE: int = 100
+    # 导出接口（NDJSON/CSV）服务端游标每次读取的行数
+    EXPORT_BATCH_SIZE: int = 1000
+    # 批量查询接口（?ids=1,2,3）单次最多的 id 数
+    BATCH_MAX_IDS: int = 100
+    # 帖子响应内嵌最新评论（include=recent_comments:N）：未指定 N 时的条数、N 的上限
+    RECENT_COMMENTS_DEFAULT: int = 3
+    RECENT_COMMENTS_MAX: int = 20
+    # 列表摘要视图（view=summary）中正文摘录的字符数
+    EXCERPT_LENGTH: int = 120
+    # 健康文章 NDJSON 批量导入：每批（一个事务）的文章数、单行最大字节数、响应中最多列出的错误行数
+    ARTICLE_IMPORT_BATCH_SIZE: int = 500
+    ARTICLE_IMPORT_MAX_LINE_BYTES: int = 1024 * 1024
+    ARTICLE_IMPORT_MAX_ERRORS: int = 100
+    # 健康文章响应缓存（单篇与列表），文章增删改时失效
+    ARTICLE_CACHE_SIZE: int = 2048
+    ARTICLE_CACHE_TTL_SECONDS: int = 300
+    # 点赞计数写回间隔（秒），0 表示每次点赞直接原子更新
+    LIKE_FLUSH_INTERVAL_SECONDS: float = 1.0
+    # 点赞/评论数实时推送（SSE）：同一帖子在窗口内（秒，0 为不合并）的多次变化合并为一条事件；心跳间隔（秒）；单进程订阅连接上限
+    EVENTS_COALESCE_SECONDS: float = 1.0
+    EVENTS_KEEPALIVE_SECONDS: float = 15.0
+    EVENTS_MAX_SUBSCRIBERS: int = 1000
+    # 热帖排行：候选帖子数量、时间窗口（小时）、刷新间隔（秒，0 为关闭）、衰减指数、标记为热帖的数量
+    HOT_RANKING_SIZE: int = 1000
+    HOT_WINDOW_HOURS: float = 72
+    HOT_REFRESH_SECONDS: float = 60
+    HOT_GRAVITY: float = 1.8
+    HOT_POSTS_COUNT: int = 20
+    # 热度写回：auto（同机多个 worker 通过文件锁选出一个写入 hot_score/is_hot，其余只在内存中计算）、
+    # writer（总是写入）、reader（从不写入，多机部署或由定时任务运行 scripts/refresh_hot_scores.py 时使用）；
+    # 锁文件留空则放在临时目录并按 DATABASE_URL 区分；分数相对变化超过该比例才写回数据库
+    HOT_RANKING_ROLE: str = "auto"
+    HOT_RANKING_LOCK_FILE: str = ""
+    HOT_SCORE_WRITE_TOLERANCE: float = 0.05
+    # 请求指标（/metrics，Prometheus 格式）；超过阈值（毫秒，0 为关闭）的请求连同 SQL 语句记录到日志
+    METRICS_ENABLED: bool = True
+    SLOW_REQUEST_MS: float = 500
+    SLOW_REQUEST_MAX_STATEMENTS: int = 50
+    # 接口 SQL 语句预算检查：off、log（超出时记录日志）、raise（超出时抛错，用于测试和预发环境）
+    QUERY_BUDGET_MODE: str = "off"
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,52 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from app.database.base import Base, engine
+
+# Indexes added to tables that existing databases already have, as
+# (table, index name). create_all skips existing tables wholesale, so these
+# are created one by one; each change that adds an index registers it here.
+LATER_INDEXES = (
+    # Keyset pagination of posts and comments
+    ("posts", "ix_posts_created_at_id"),
+    ("comments", "ix_comments_post_id_created_at_id"),
+    # Tag filter through post_tags, for databases that created the table early
+    ("post_tags", "ix_post_tags_tag_post_id"),
+    # Article listing by category and date
+    ("health_articles", "ix_health_articles_category_created_at"),
+    ("health_articles", "ix_health_articles_created_at_id"),
+    # Hot feed ordering; the column itself is added by _add_later_columns
+    ("posts", "ix_posts_hot_score"),
+    # Export order of comments
+    ("comments", "ix_comments_created_at_id"),
+)
+
+def _add_later_columns(bind: Engine) -> None:
+    # create_all never alters tables; posts.hot_score came after the table
+    if "hot_score" not in {column["name"] for column in inspect(bind).get_columns("posts")}:
+        with bind.begin() as conn:
+            conn.execute(text("ALTER TABLE posts ADD COLUMN hot_score FLOAT DEFAULT 0"))
+
+def _create_later_indexes(bind: Engine = engine) -> None:
+    for table_name, index_name in LATER_INDEXES:
+        index = next(
+            index for index in Base.metadata.tables[table_name].indexes if index.name == index_name
+        )
+        index.create(bind, checkfirst=True)
+
+def init_database(bind: Engine = engine) -> None:
+    """
+    Create missing tables and indexes, plus the search backend's storage.
+    Idempotent; run by ``scripts/init_db.py`` or, when
+    ``DB_CREATE_SCHEMA_ON_STARTUP`` is set, by the app's lifespan hook.
+    """
+    # Register every model on Base.metadata before creating tables
+    import app.auth.models  # noqa: F401
+    import app.community.models  # noqa: F401
+    import app.health.models  # noqa: F401
+    from app.health.search import get_search_backend
+
+    Base.metadata.create_all(bind=bind)
+    _add_later_columns(bind)
+    _create_later_indexes(bind)
+    get_search_backend().setup(bind)
@@ -0,0 +1,76 @@
+import hashlib
+import itertools
+import json
+from typing import Hashable, List, NamedTuple, Optional
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.cache import TTLCache
+from app.config import settings
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+
+# Totals for article listings keyed by filter
+article_count_cache = TTLCache(
+    maxsize=settings.COUNT_CACHE_SIZE,
+    ttl=settings.COUNT_CACHE_TTL_SECONDS,
+)
+# Serialized responses: single articles by id, listings by normalized query
+article_cache = TTLCache(
+    maxsize=settings.ARTICLE_CACHE_SIZE,
+    ttl=settings.ARTICLE_CACHE_TTL_SECONDS,
+)
+article_list_cache = TTLCache(
+    maxsize=settings.ARTICLE_CACHE_SIZE,
+    ttl=settings.ARTICLE_CACHE_TTL_SECONDS,
+)
+
+# Bumped on every invalidation so a read that raced a write doesn't cache stale data
+_generation = itertools.count()
+_current_generation = next(_generation)
+
+def generation() -> int:
+    return _current_generation
+
+def invalidate_articles(article_id: Optional[int] = None):
+    global _current_generation
+    _current_generation = next(_generation)
+    article_count_cache.clear()
+    article_list_cache.clear()
+    if article_id is not None:
+        article_cache.pop(article_id)
+
+def build_entry(model: BaseModel) -> CachedResponse:
+    body = model.model_dump_json().encode()
+    # Strong validator: identical bytes, identical tag
+    return CachedResponse(body, '"{}"'.format(hashlib.blake2b(body, digest_size=16).hexdigest()))
+
+def combine_entries(key: str, entries: List[Optional[CachedResponse]], not_found: List[int]) -> CachedResponse:
+    """Splice cached bodies into ``{key: [...], "not_found": [...]}`` without re-serializing them."""
+    items = b",".join(b"null" if entry is None else entry.body for entry in entries)
+    body = b'{"%s":[%s],"not_found":%s}' % (key.encode(), items, json.dumps(not_found).encode())
+    return CachedResponse(body, '"{}"'.format(hashlib.blake2b(body, digest_size=16).hexdigest()))
+
+def store(cache: TTLCache, key: Hashable, entry: CachedResponse, read_generation: int):
+    if read_generation == _current_generation:
+        cache.set(key, entry)
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so ignore W/ prefixes
+    candidates = (tag.strip() for tag in header.split(","))
+    return any(tag[2:] == etag if tag.startswith("W/") else tag == etag for tag in candidates)
+
+def conditional_response(request: Request, entry: CachedResponse) -> Response:
+    # Clients may keep the body but must revalidate before reusing it
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
@@ -0,0 +1,122 @@
+import logging
+from typing import List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.health import schemas, utils
+
+logger = logging.getLogger(__name__)
+
+class LineSplitter:
+    """
+    Incremental NDJSON framing: feed byte chunks as they arrive, get back
+    the complete lines. A line longer than ``max_bytes`` comes back as None
+    and its bytes are dropped, so one runaway record can't exhaust memory.
+    """
+
+    def __init__(self, max_bytes: int = settings.ARTICLE_IMPORT_MAX_LINE_BYTES):
+        self.max_bytes = max_bytes
+        self._buffer = bytearray()
+        self._oversized = False
+
+    def feed(self, chunk: bytes) -> List[Optional[bytes]]:
+        lines = []
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end < 0:
+                break
+            lines.append(self._finish(chunk[start:end]))
+            start = end + 1
+        self._append(chunk[start:])
+        return lines
+
+    def close(self) -> List[Optional[bytes]]:
+        """The last line, when the input doesn't end with a newline."""
+        if self._buffer or self._oversized:
+            return [self._finish(b"")]
+        return []
+
+    def _append(self, part: bytes):
+        if self._oversized:
+            return
+        self._buffer += part
+        if len(self._buffer) > self.max_bytes:
+            self._oversized = True
+            self._buffer.clear()
+
+    def _finish(self, part: bytes) -> Optional[bytes]:
+        self._append(part)
+        line = None if self._oversized else bytes(self._buffer)
+        self._buffer.clear()
+        self._oversized = False
+        return line
+
+def describe(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+        for error in exc.errors()
+    )
+
+class ArticleImport:
+    """
+    Bulk import of NDJSON articles, one ``HealthArticleCreate`` per line.
+
+    ``add`` validates a line and queues it; once ``batch_size`` articles are
+    queued the caller runs ``insert``, which writes them with
+    ``utils.bulk_create_articles`` in one transaction. Invalid lines and
+    batches the database rejects are recorded by line number and the import
+    carries on. Blank lines are skipped but still counted.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = settings.ARTICLE_IMPORT_BATCH_SIZE,
+        max_errors: int = settings.ARTICLE_IMPORT_MAX_ERRORS,
+    ):
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.line_no = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors: List[schemas.ArticleImportError] = []
+        self._batch: List[Tuple[int, schemas.HealthArticleCreate]] = []
+
+    def add(self, line: Optional[bytes]) -> bool:
+        """Validate one line (None for an oversized one); True when a batch is ready."""
+        self.line_no += 1
+        if line is None:
+            self._error(self.line_no, f"Line longer than {settings.ARTICLE_IMPORT_MAX_LINE_BYTES} bytes")
+        elif line.strip():
+            try:
+                self._batch.append((self.line_no, schemas.HealthArticleCreate.model_validate_json(line)))
+            except ValidationError as exc:
+                self._error(self.line_no, describe(exc))
+        return len(self._batch) >= self.batch_size
+
+    def insert(self, db: Session) -> int:
+        """Write the queued articles; returns how many were inserted."""
+        batch, self._batch = self._batch, []
+        if not batch:
+            return 0
+        try:
+            utils.bulk_create_articles(db, [article for _, article in batch])
+        except SQLAlchemyError as exc:
+            db.rollback()
+            logger.exception("Article import batch of lines %d-%d failed", batch[0][0], batch[-1][0])
+            for line_no, _ in batch:
+                self._error(line_no, f"Not inserted: {type(exc).__name__}")
+            return 0
+        self.inserted += len(batch)
+        return len(batch)
+
+    def _error(self, line_no: int, message: str):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(schemas.ArticleImportError(line=line_no, error=message))
+
+    def result(self) -> schemas.ArticleImportResult:
+        return schemas.ArticleImportResult(inserted=self.inserted, failed=self.failed, errors=self.errors)
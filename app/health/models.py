@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, Integer, Text
+from sqlalchemy import Column, DateTime, Index, String, Integer, Text
+from sqlalchemy.orm import query_expression
 
 from app.database.base import Base
 
@@ -11,4 +12,12 @@ class HealthArticle(Base):
     category = Column(String(50))  # 例如：营养、运动、心理等
     tags = Column(String(200))     # 逗号分隔的标签
     author = Column(String(100))
-    created_at = Column(String(50))  # ISO格式的日期时间
+    created_at = Column(DateTime)
+    # Leading slice of content, only populated by summary queries
+    excerpt = query_expression()
+
+    __table_args__ = (
+        # Category listings and the default newest-first feed, with id as tiebreaker
+        Index("ix_health_articles_category_created_at", "category", "created_at"),
+        Index("ix_health_articles_created_at_id", "created_at", "id"),
+    )
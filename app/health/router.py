@@ -1,51 +1,165 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional, Union
 
+from app.config import settings
 from app.database.base import get_db
+from app.export import ExportFormat, export_response
 from app.health import utils, schemas
+from app.metrics import query_budget
+from app.health.cache import (
+    article_cache, article_list_cache, build_entry, combine_entries, conditional_response, generation, store
+)
+from app.health.importer import ArticleImport, LineSplitter
+from app.params import parse_ids
 
 router = APIRouter()
 
+# Declared before /articles/{article_id} so "export" isn't parsed as an id
+@router.get("/articles/export", response_class=StreamingResponse)
+@query_budget(1)
+async def export_articles(
+    fmt: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    since: Optional[datetime] = Query(None, description="Only articles created at or after this time"),
+):
+    """
+    Export every health article as NDJSON or CSV, oldest first, streamed
+    through a server-side cursor. The NDJSON output can be fed back to
+    ``/articles/import``.
+    """
+    return export_response(utils.articles_export(since), "articles", fmt)
+
+# Declared before /articles/{article_id} so "batch" isn't parsed as an id
+@router.get("/articles/batch", response_model=Union[schemas.HealthArticleBatch, schemas.HealthArticleSummaryBatch])
+@query_budget(1)
+def read_articles_batch(
+    request: Request,
+    ids: List[int] = Depends(parse_ids),
+    view: schemas.ArticleView = schemas.ArticleView.FULL,
+    db: Session = Depends(get_db)
+):
+    """
+    Get several health articles in one round trip, in the order of ``ids``.
+
+    Missing articles come back as null and are listed in ``not_found``.
+    Full articles are served from (and fill) the single-article cache, so
+    only uncached ids hit the database.
+    """
+    if view == schemas.ArticleView.SUMMARY:
+        by_id = utils.get_articles_by_ids(db, ids, summary=True)
+        entry = build_entry(schemas.HealthArticleSummaryBatch.model_validate({
+            "articles": [by_id.get(article_id) for article_id in ids],
+            "not_found": [article_id for article_id in ids if article_id not in by_id],
+        }, from_attributes=True))
+        return conditional_response(request, entry)
+
+    entries = {article_id: article_cache.get(article_id) for article_id in ids}
+    missing = [article_id for article_id, entry in entries.items() if entry is None]
+    if missing:
+        read_generation = generation()
+        for article_id, article in utils.get_articles_by_ids(db, missing).items():
+            entries[article_id] = build_entry(schemas.HealthArticle.model_validate(article))
+            store(article_cache, article_id, entries[article_id], read_generation)
+    not_found = [article_id for article_id in ids if entries[article_id] is None]
+    return conditional_response(request, combine_entries("articles", [entries[i] for i in ids], not_found))
+
 @router.get("/articles/{article_id}", response_model=schemas.HealthArticle)
-def read_article(article_id: int, db: Session = Depends(get_db)):
+@query_budget(1)
+def read_article(article_id: int, request: Request, db: Session = Depends(get_db)):
     """
     Get a specific health article by ID.
+
+    Served from the response cache when possible; honours If-None-Match.
     """
-    db_article = utils.get_article(db, article_id=article_id)
-    if db_article is None:
-        raise HTTPException(status_code=404, detail="Article not found")
-    return db_article
+    entry = article_cache.get(article_id)
+    if entry is None:
+        read_generation = generation()
+        db_article = utils.get_article(db, article_id=article_id)
+        if db_article is None:
+            raise HTTPException(status_code=404, detail="Article not found")
+        entry = build_entry(schemas.HealthArticle.model_validate(db_article))
+        store(article_cache, article_id, entry, read_generation)
+    return conditional_response(request, entry)
 
-@router.get("/articles", response_model=schemas.HealthArticleList)
+@router.get("/articles", response_model=Union[schemas.HealthArticleList, schemas.HealthArticleSummaryList])
+@query_budget(3)
 def read_articles(
+    request: Request,
     skip: int = 0, 
-    limit: int = 10, 
+    limit: int = Query(10, description=f"Clamped to 0..{settings.MAX_PAGE_SIZE}"), 
     category: Optional[str] = None,
     tag: Optional[str] = None,
     search: Optional[str] = None,
-    sort_by: str = Query("created_at", regex="^(created_at|title)$"),
+    # Defaults to relevance when searching, created_at otherwise
+    sort_by: Optional[str] = Query(None, pattern="^(created_at|title|relevance)$"),
     sort_desc: bool = True,
+    include_total: bool = True,
+    view: schemas.ArticleView = schemas.ArticleView.FULL,
     db: Session = Depends(get_db)
 ):
     """
     Get all health articles with filtering, pagination and sorting.
+
+    ``view=summary`` returns an excerpt instead of the full content.
+    Served from the response cache when possible; honours If-None-Match.
     """
-    articles = utils.get_articles(
-        db, skip=skip, limit=limit, category=category, 
-        tag=tag, search=search, sort_by=sort_by, sort_desc=sort_desc
-    )
-    total = utils.get_articles_count(db, category=category, tag=tag, search=search)
-    return {"articles": articles, "total": total}
+    # Clamped like PostFilter rather than rejected; SQLite reads LIMIT -1 as no limit
+    limit = max(0, min(limit, settings.MAX_PAGE_SIZE))
+    summary = view == schemas.ArticleView.SUMMARY
+    key = (skip, limit, category, tag, search, sort_by, sort_desc, include_total, summary)
+    entry = article_list_cache.get(key)
+    if entry is None:
+        read_generation = generation()
+        articles = utils.get_articles(
+            db, skip=skip, limit=limit, category=category, 
+            tag=tag, search=search, sort_by=sort_by, sort_desc=sort_desc, summary=summary
+        )
+        total = None
+        if include_total:
+            total = utils.get_articles_count(db, category=category, tag=tag, search=search)
+        schema = schemas.HealthArticleSummaryList if summary else schemas.HealthArticleList
+        entry = build_entry(schema.model_validate(
+            {"articles": articles, "total": total}, from_attributes=True
+        ))
+        store(article_list_cache, key, entry, read_generation)
+    return conditional_response(request, entry)
 
 @router.post("/articles", response_model=schemas.HealthArticle)
+@query_budget(4)
 def create_article(article: schemas.HealthArticleCreate, db: Session = Depends(get_db)):
     """
     Create a new health article.
     """
     return utils.create_article(db=db, article=article)
 
+@router.post("/articles/import", response_model=schemas.ArticleImportResult)
+async def import_articles(
+    request: Request,
+    batch_size: int = Query(settings.ARTICLE_IMPORT_BATCH_SIZE, gt=0, le=10000),
+    db: Session = Depends(get_db)
+):
+    """
+    Bulk-import health articles from an NDJSON body, one article per line.
+
+    The body is parsed as it arrives and inserted ``batch_size`` articles per
+    transaction. Invalid lines are skipped and reported by line number.
+    """
+    job = ArticleImport(batch_size=batch_size)
+    splitter = LineSplitter()
+    async for chunk in request.stream():
+        for line in splitter.feed(chunk):
+            if job.add(line):
+                await run_in_threadpool(job.insert, db)
+    for line in splitter.close():
+        job.add(line)
+    await run_in_threadpool(job.insert, db)
+    return job.result()
+
 @router.put("/articles/{article_id}", response_model=schemas.HealthArticle)
+@query_budget(5)
 def update_article(article_id: int, article_update: schemas.HealthArticleCreate, db: Session = Depends(get_db)):
     """
     Update a health article.
@@ -56,6 +170,7 @@ def update_article(article_id: int, article_update: schemas.HealthArticleCreate,
     return db_article
 
 @router.delete("/articles/{article_id}")
+@query_budget(3)
 def delete_article(article_id: int, db: Session = Depends(get_db)):
     """
     Delete a health article.
@@ -1,5 +1,11 @@
+from datetime import datetime
+from enum import Enum
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
+
+class ArticleView(str, Enum):
+    FULL = "full"
+    SUMMARY = "summary"
 
 class HealthArticleBase(BaseModel):
     title: str
@@ -13,11 +19,50 @@ class HealthArticleCreate(HealthArticleBase):
 
 class HealthArticle(HealthArticleBase):
     id: int
-    created_at: str
+    created_at: datetime
+    # Match context as HTML (escaped text, <mark> around hits); only set on search results
+    snippet: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class HealthArticleSummary(BaseModel):
+    id: int
+    title: str
+    excerpt: Optional[str] = None
+    category: str
+    tags: str
+    author: str
+    created_at: datetime
+    snippet: Optional[str] = None
 
     class Config:
         from_attributes = True
 
 class HealthArticleList(BaseModel):
     articles: List[HealthArticle]
-    total: int
+    # None when the request opted out with include_total=false
+    total: Optional[int] = None
+
+class HealthArticleBatch(BaseModel):
+    # Aligned with the requested ids; null where the article doesn't exist
+    articles: List[Optional[HealthArticle]]
+    not_found: List[int]
+
+class HealthArticleSummaryBatch(BaseModel):
+    articles: List[Optional[HealthArticleSummary]]
+    not_found: List[int]
+
+class HealthArticleSummaryList(BaseModel):
+    articles: List[HealthArticleSummary]
+    total: Optional[int] = None
+
+class ArticleImportError(BaseModel):
+    line: int
+    error: str
+
+class ArticleImportResult(BaseModel):
+    inserted: int
+    failed: int
+    # The first ARTICLE_IMPORT_MAX_ERRORS failures; ``failed`` counts them all
+    errors: List[ArticleImportError]
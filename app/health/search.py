@@ -0,0 +1,250 @@
+import html
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+from sqlalchemy import asc, desc, func, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.health import models
+
+class SearchHit(NamedTuple):
+    article_id: int
+    snippet: Optional[str] = None
+
+class SearchBackend:
+    """
+    Full-text search over health articles.
+
+    The article table stays the source of truth: utils calls ``index``/``remove``
+    inside the same session as each write, and ``search``/``count`` return ids
+    that the caller loads from ``health_articles``.
+    """
+
+    name = "base"
+
+    def setup(self, engine: Engine) -> None:
+        """Create any storage the backend needs; called once at startup."""
+
+    def index(self, db: Session, article: models.HealthArticle) -> None:
+        """Add or replace ``article`` in the index."""
+
+    def remove(self, db: Session, article_id: int) -> None:
+        """Drop ``article_id`` from the index."""
+
+    def index_many(self, db: Session, articles: Sequence[Tuple[int, str, str]]) -> None:
+        """Add newly inserted ``(id, title, content)`` rows in one go; used by bulk imports."""
+
+    def rebuild(self, db: Session) -> int:
+        """Re-index every article; returns the number indexed."""
+        return 0
+
+    def search(
+        self,
+        db: Session,
+        query: str,
+        category: Optional[str] = None,
+        tag: Optional[str] = None,
+        sort_by: str = "relevance",
+        sort_desc: bool = True,
+        skip: int = 0,
+        limit: int = 10,
+    ) -> List[SearchHit]:
+        raise NotImplementedError
+
+    def count(
+        self,
+        db: Session,
+        query: str,
+        category: Optional[str] = None,
+        tag: Optional[str] = None,
+    ) -> int:
+        raise NotImplementedError
+
+class LikeSearchBackend(SearchBackend):
+    """Substring matching with LIKE; works on any database but scans the table."""
+
+    name = "like"
+
+    def _filtered(self, db: Session, columns, query: str, category: Optional[str], tag: Optional[str]):
+        q = db.query(*columns).filter(
+            models.HealthArticle.title.like(f"%{query}%") |
+            models.HealthArticle.content.like(f"%{query}%")
+        )
+        if category:
+            q = q.filter(models.HealthArticle.category == category)
+        if tag:
+            q = q.filter(models.HealthArticle.tags.like(f"%{tag}%"))
+        return q
+
+    def search(self, db, query, category=None, tag=None, sort_by="relevance", sort_desc=True, skip=0, limit=10):
+        q = self._filtered(db, [models.HealthArticle.id], query, category, tag)
+        # No relevance signal here, newest first stands in for it
+        column = models.HealthArticle.title if sort_by == "title" else models.HealthArticle.created_at
+        direction = desc if sort_desc or sort_by == "relevance" else asc
+        q = q.order_by(direction(column), direction(models.HealthArticle.id))
+        return [SearchHit(row.id) for row in q.offset(skip).limit(limit).all()]
+
+    def count(self, db, query, category=None, tag=None):
+        return self._filtered(db, [func.count(models.HealthArticle.id)], query, category, tag).scalar()
+
+# CJK ideographs, kana and hangul: scripts written without spaces between words
+CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+_CJK_CHAR = re.compile(f"([{CJK}])")
+_SPACES = re.compile(r"\s+")
+# Private-use characters mark highlights until the snippet is de-segmented
+_HL_OPEN, _HL_CLOSE = "\ue000", "\ue001"
+# CJK punctuation and full-width forms also sit flush against their neighbours
+_JOINABLE = f"[{CJK}\u3000-\u303f\uff00-\uffef{_HL_OPEN}{_HL_CLOSE}]"
+_SEGMENT_GAP = re.compile(f"(?<={_JOINABLE}) (?={_JOINABLE})")
+
+def segment(value: str) -> str:
+    """
+    Split CJK runs into single characters so the unicode61 tokenizer indexes
+    each one; multi-character queries then match as adjacent-token phrases.
+    """
+    return _SPACES.sub(" ", _CJK_CHAR.sub(r" \1 ", value or "")).strip()
+
+def desegment(value: str) -> str:
+    return _SEGMENT_GAP.sub("", value)
+
+def render_snippet(value: str) -> str:
+    """
+    HTML for a raw FTS snippet: article text is escaped, so only the
+    highlight markers become markup.
+    """
+    return html.escape(desegment(value)).replace(_HL_OPEN, "<mark>").replace(_HL_CLOSE, "</mark>")
+
+def build_match_query(query: str) -> str:
+    # Every whitespace-separated term must match, each as a quoted phrase
+    terms = [segment(term) for term in query.split()]
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in terms if term)
+
+class SQLiteFTS5Backend(SearchBackend):
+    """
+    SQLite FTS5 index ranked with bm25 (title weighted over content) and
+    highlighted with snippet(). Text is stored pre-segmented, see ``segment``.
+    """
+
+    name = "fts5"
+    table = "health_articles_fts"
+    title_weight = 10.0
+    content_weight = 1.0
+
+    def setup(self, engine: Engine) -> None:
+        with engine.begin() as conn:
+            conn.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} "
+                "USING fts5(title, content, tokenize='unicode61')"
+            ))
+            indexed = conn.execute(text(f"SELECT count(*) FROM {self.table}")).scalar()
+            articles = conn.execute(text("SELECT count(*) FROM health_articles")).scalar()
+        # Rows written around the app (seed scripts, manual SQL) leave the index behind
+        if indexed != articles:
+            with Session(bind=engine) as db:
+                self.rebuild(db)
+                db.commit()
+
+    def _insert(self, db: Session, article_id: int, title: str, content: str):
+        db.execute(
+            text(f"INSERT INTO {self.table} (rowid, title, content) VALUES (:id, :title, :content)"),
+            {"id": article_id, "title": segment(title), "content": segment(content)},
+        )
+
+    def index(self, db: Session, article: models.HealthArticle) -> None:
+        self.remove(db, article.id)
+        self._insert(db, article.id, article.title, article.content)
+
+    def remove(self, db: Session, article_id: int) -> None:
+        db.execute(text(f"DELETE FROM {self.table} WHERE rowid = :id"), {"id": article_id})
+
+    def index_many(self, db: Session, articles: Sequence[Tuple[int, str, str]]) -> None:
+        if not articles:
+            return
+        db.execute(
+            text(f"INSERT INTO {self.table} (rowid, title, content) VALUES (:id, :title, :content)"),
+            [
+                {"id": article_id, "title": segment(title), "content": segment(content)}
+                for article_id, title, content in articles
+            ],
+        )
+
+    def rebuild(self, db: Session) -> int:
+        db.execute(text(f"DELETE FROM {self.table}"))
+        count = 0
+        rows = db.query(
+            models.HealthArticle.id, models.HealthArticle.title, models.HealthArticle.content
+        ).yield_per(500)
+        for row in rows:
+            self._insert(db, row.id, row.title, row.content)
+            count += 1
+        return count
+
+    def _where(self, category: Optional[str], tag: Optional[str]) -> str:
+        clauses = [f"{self.table} MATCH :match"]
+        if category:
+            clauses.append("a.category = :category")
+        if tag:
+            clauses.append("a.tags LIKE :tag")
+        return " AND ".join(clauses)
+
+    def _params(self, query: str, category: Optional[str], tag: Optional[str]) -> dict:
+        return {"match": build_match_query(query), "category": category, "tag": f"%{tag}%"}
+
+    def search(self, db, query, category=None, tag=None, sort_by="relevance", sort_desc=True, skip=0, limit=10):
+        params = self._params(query, category, tag)
+        if not params["match"]:
+            return []
+        if sort_by == "relevance":
+            # bm25 is lower-is-better
+            order = f"bm25({self.table}, {self.title_weight}, {self.content_weight})"
+        else:
+            column = "a.title" if sort_by == "title" else "a.created_at"
+            direction = "DESC" if sort_desc else "ASC"
+            order = f"{column} {direction}, a.id {direction}"
+        rows = db.execute(
+            text(
+                f"SELECT a.id, snippet({self.table}, 1, '{_HL_OPEN}', '{_HL_CLOSE}', '…', 16) AS snippet "
+                f"FROM {self.table} JOIN health_articles a ON a.id = {self.table}.rowid "
+                f"WHERE {self._where(category, tag)} ORDER BY {order} LIMIT :limit OFFSET :skip"
+            ),
+            {**params, "limit": limit, "skip": skip},
+        ).all()
+        return [
+            SearchHit(row.id, render_snippet(row.snippet))
+            for row in rows
+        ]
+
+    def count(self, db, query, category=None, tag=None):
+        params = self._params(query, category, tag)
+        if not params["match"]:
+            return 0
+        return db.execute(
+            text(
+                f"SELECT count(*) FROM {self.table} JOIN health_articles a ON a.id = {self.table}.rowid "
+                f"WHERE {self._where(category, tag)}"
+            ),
+            params,
+        ).scalar()
+
+SEARCH_BACKENDS: Dict[str, Type[SearchBackend]] = {
+    LikeSearchBackend.name: LikeSearchBackend,
+    SQLiteFTS5Backend.name: SQLiteFTS5Backend,
+}
+
+_backend: Optional[SearchBackend] = None
+
+def get_search_backend() -> SearchBackend:
+    global _backend
+    if _backend is None:
+        name = settings.SEARCH_BACKEND
+        if name == "auto":
+            name = "fts5" if settings.DATABASE_URL.startswith("sqlite") else "like"
+        _backend = SEARCH_BACKENDS[name]()
+    return _backend
+
+def set_search_backend(backend: SearchBackend) -> None:
+    """Swap the active backend, e.g. for an external engine or in tests."""
+    global _backend
+    _backend = backend
@@ -1,13 +1,34 @@
 from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import func, asc, desc
-from typing import Optional, List
+from sqlalchemy.orm import Session, load_only, with_expression
+from sqlalchemy import Select, func, asc, desc, insert, select
+from typing import Dict, Optional, List
 
+from app.config import settings
+from app.export import created_since
 from app.health import models, schemas
+from app.health.cache import article_count_cache, invalidate_articles
+from app.health.search import get_search_backend
 
 def get_article(db: Session, article_id: int) -> Optional[models.HealthArticle]:
     return db.query(models.HealthArticle).filter(models.HealthArticle.id == article_id).first()
 
+def summary_options() -> tuple:
+    """Load everything but ``content``, plus a SQL-side excerpt of it."""
+    article = models.HealthArticle
+    return (
+        load_only(article.id, article.title, article.category, article.tags, article.author, article.created_at),
+        with_expression(article.excerpt, func.substr(article.content, 1, settings.EXCERPT_LENGTH)),
+    )
+
+def get_articles_by_ids(db: Session, article_ids: List[int], summary: bool = False) -> Dict[int, models.HealthArticle]:
+    """Articles in one IN query, keyed by id; missing ids are simply absent."""
+    if not article_ids:
+        return {}
+    query = db.query(models.HealthArticle).filter(models.HealthArticle.id.in_(set(article_ids)))
+    if summary:
+        query = query.options(*summary_options())
+    return {article.id: article for article in query}
+
 def get_articles(
     db: Session, 
     skip: int = 0, 
@@ -15,10 +36,19 @@ def get_articles(
     category: Optional[str] = None,
     tag: Optional[str] = None,
     search: Optional[str] = None,
-    sort_by: str = "created_at",
-    sort_desc: bool = True
+    sort_by: Optional[str] = None,
+    sort_desc: bool = True,
+    summary: bool = False
 ) -> List[models.HealthArticle]:
+    if search:
+        return search_articles(
+            db, search, skip=skip, limit=limit, category=category, tag=tag,
+            sort_by=sort_by or "relevance", sort_desc=sort_desc, summary=summary
+        )
+
     query = db.query(models.HealthArticle)
+    if summary:
+        query = query.options(*summary_options())
     
     if category:
         query = query.filter(models.HealthArticle.category == category)
@@ -26,31 +56,75 @@ def get_articles(
     if tag:
         query = query.filter(models.HealthArticle.tags.like(f"%{tag}%"))
     
-    if search:
-        query = query.filter(
-            models.HealthArticle.title.like(f"%{search}%") | 
-            models.HealthArticle.content.like(f"%{search}%")
-        )
-    
-    if sort_by == "created_at":
-        if sort_desc:
-            query = query.order_by(desc(models.HealthArticle.created_at))
-        else:
-            query = query.order_by(asc(models.HealthArticle.created_at))
-    elif sort_by == "title":
+    if sort_by == "title":
         if sort_desc:
             query = query.order_by(desc(models.HealthArticle.title))
         else:
             query = query.order_by(asc(models.HealthArticle.title))
+    else:
+        if sort_desc:
+            query = query.order_by(desc(models.HealthArticle.created_at), desc(models.HealthArticle.id))
+        else:
+            query = query.order_by(asc(models.HealthArticle.created_at), asc(models.HealthArticle.id))
     
     return query.offset(skip).limit(limit).all()
 
+def search_articles(
+    db: Session,
+    search: str,
+    skip: int = 0,
+    limit: int = 10,
+    category: Optional[str] = None,
+    tag: Optional[str] = None,
+    sort_by: str = "relevance",
+    sort_desc: bool = True,
+    summary: bool = False
+) -> List[models.HealthArticle]:
+    hits = get_search_backend().search(
+        db, search, category=category, tag=tag,
+        sort_by=sort_by, sort_desc=sort_desc, skip=skip, limit=limit
+    )
+    if not hits:
+        return []
+    query = db.query(models.HealthArticle).filter(
+        models.HealthArticle.id.in_([hit.article_id for hit in hits])
+    )
+    if summary:
+        query = query.options(*summary_options())
+    by_id = {article.id: article for article in query}
+    articles = []
+    for hit in hits:
+        article = by_id.get(hit.article_id)
+        if article is not None:
+            # Transient attribute picked up by the response schema
+            article.snippet = hit.snippet
+            articles.append(article)
+    return articles
+
+def articles_export(since: Optional[datetime] = None) -> Select:
+    query = select(
+        models.HealthArticle.id, models.HealthArticle.title, models.HealthArticle.content,
+        models.HealthArticle.category, models.HealthArticle.tags, models.HealthArticle.author,
+        models.HealthArticle.created_at,
+    )
+    return created_since(query, models.HealthArticle, since)
+
 def get_articles_count(
     db: Session, 
     category: Optional[str] = None,
     tag: Optional[str] = None,
     search: Optional[str] = None
 ) -> int:
+    key = (category, tag, search)
+    total = article_count_cache.get(key)
+    if total is not None:
+        return total
+
+    if search:
+        total = get_search_backend().count(db, search, category=category, tag=tag)
+        article_count_cache.set(key, total)
+        return total
+
     query = db.query(func.count(models.HealthArticle.id))
     
     if category:
@@ -59,13 +133,9 @@ def get_articles_count(
     if tag:
         query = query.filter(models.HealthArticle.tags.like(f"%{tag}%"))
     
-    if search:
-        query = query.filter(
-            models.HealthArticle.title.like(f"%{search}%") | 
-            models.HealthArticle.content.like(f"%{search}%")
-        )
-    
-    return query.scalar()
+    total = query.scalar()
+    article_count_cache.set(key, total)
+    return total
 
 def create_article(db: Session, article: schemas.HealthArticleCreate) -> models.HealthArticle:
     db_article = models.HealthArticle(
@@ -74,19 +144,49 @@ def create_article(db: Session, article: schemas.HealthArticleCreate) -> models.
         category=article.category,
         tags=article.tags,
         author=article.author,
-        created_at=datetime.now().isoformat()
+        created_at=datetime.now()
     )
     db.add(db_article)
+    db.flush()
+    get_search_backend().index(db, db_article)
     db.commit()
+    invalidate_articles()
     db.refresh(db_article)
     return db_article
 
+def bulk_create_articles(db: Session, articles: List[schemas.HealthArticleCreate]) -> List[int]:
+    """
+    Insert ``articles`` with one executemany and index them, in a single
+    transaction. Returns the new ids in input order.
+    """
+    now = datetime.now()
+    rows = [dict(article.model_dump(), created_at=now) for article in articles]
+    if db.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+        ids = list(db.scalars(
+            insert(models.HealthArticle).returning(models.HealthArticle.id, sort_by_parameter_order=True),
+            rows,
+        ))
+    else:
+        # No ordered RETURNING for executemany (MySQL): let the ORM fetch ids row by row
+        db_articles = [models.HealthArticle(**row) for row in rows]
+        db.add_all(db_articles)
+        db.flush()
+        ids = [db_article.id for db_article in db_articles]
+    get_search_backend().index_many(
+        db, [(article_id, row["title"], row["content"]) for article_id, row in zip(ids, rows)]
+    )
+    db.commit()
+    invalidate_articles()
+    return ids
+
 def update_article(db: Session, article_id: int, article: schemas.HealthArticleCreate) -> Optional[models.HealthArticle]:
     db_article = get_article(db, article_id)
     if db_article:
         for key, value in article.dict().items():
             setattr(db_article, key, value)
+        get_search_backend().index(db, db_article)
         db.commit()
+        invalidate_articles(article_id)
         db.refresh(db_article)
     return db_article
 
@@ -94,6 +194,8 @@ def delete_article(db: Session, article_id: int) -> bool:
     db_article = get_article(db, article_id)
     if db_article:
         db.delete(db_article)
+        get_search_backend().remove(db, article_id)
         db.commit()
+        invalidate_articles(article_id)
         return True
     return False
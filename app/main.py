@@ -1,19 +1,46 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.auth.router import router as auth_router
 from app.health.router import router as health_router
 from app.community import community_router
 from app.config import settings
-from app.database.base import Base, engine
+from app.responses import FastJSONResponse
+from app.database.base import async_engine, engine
+from app.database.schema import init_database
+from app.auth.hashing import password_hasher
+from app.community.events import counter_hub
+from app.community.likes import like_counter
+from app.community.ranking import hot_ranking
+from app.metrics import MetricsMiddleware, instrument_engine, metrics
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema work happens at startup, not import, so importing the app never touches the database
+    if settings.DB_CREATE_SCHEMA_ON_STARTUP:
+        await asyncio.to_thread(init_database)
+    like_counter.start()
+    hot_ranking.start()
+    counter_hub.start()
+    yield
+    # Closes open event streams so the worker can exit
+    await counter_hub.stop()
+    await hot_ranking.stop()
+    # Write out buffered like counts before the worker exits
+    await like_counter.stop()
+    password_hasher.shutdown()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="健康管理和孕期指导API服务",
     version=settings.VERSION,
+    lifespan=lifespan,
+    # Swap in another JSONResponse subclass here to change the encoder app-wide
+    default_response_class=FastJSONResponse,
 )
 
 # Configure CORS
@@ -23,8 +50,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Non-safelisted response headers browsers may read; list_comments' keyset cursor
+    expose_headers=["X-Next-Cursor"],
 )
 
+# The middleware also enforces query budgets, so it stays on for those alone
+if settings.METRICS_ENABLED or settings.QUERY_BUDGET_MODE != "off":
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+    # Added last so it wraps CORS and times the whole request
+    app.add_middleware(MetricsMiddleware)
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def read_metrics():
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # Include routers
 app.include_router(auth_router, prefix=f"{settings.API_V1_STR}/auth", tags=["认证"])
 app.include_router(health_router, prefix=f"{settings.API_V1_STR}/health", tags=["健康"])
@@ -44,6 +85,7 @@ def read_root():
             f"{settings.API_V1_STR}/health/articles",
             f"{settings.API_V1_STR}/community/posts",
             f"{settings.API_V1_STR}/community/posts/{{post_id}}/comments",
-            f"{settings.API_V1_STR}/community/posts/{{post_id}}/like"
+            f"{settings.API_V1_STR}/community/posts/{{post_id}}/like",
+            f"{settings.API_V1_STR}/community/posts/{{post_id}}/events"
         ]
     }
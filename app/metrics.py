@@ -0,0 +1,291 @@
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Prometheus' default buckets, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    """Cumulative-bucket histogram; callers hold the registry lock."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class RequestStats:
+    """SQL activity of one request (or ``count_queries`` block), filled in by the engine listeners."""
+
+    __slots__ = ("queries", "db_seconds", "statements", "scope")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.statements: List[Tuple[str, float]] = []
+        # ASGI scope of the request, for looking up the matched route's budget
+        self.scope = scope
+
+    def record(self, statement: str, elapsed: float):
+        self.queries += 1
+        self.db_seconds += elapsed
+        if len(self.statements) < settings.SLOW_REQUEST_MAX_STATEMENTS:
+            self.statements.append((statement, elapsed))
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+# Counters opened by ``count_queries`` in this context, outermost first
+_counters: ContextVar[Tuple[RequestStats, ...]] = ContextVar("query_counters", default=())
+
+Labels = Tuple[str, ...]
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.requests: Dict[Labels, int] = {}
+        self.latency: Dict[Labels, Histogram] = {}
+        self.db_time: Dict[Labels, Histogram] = {}
+        self.db_queries: Dict[Labels, int] = {}
+        # Every statement, request-bound or not (background tasks, scripts)
+        self.statements = Histogram()
+
+    def request_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, method: str, route: str, status: int, elapsed: float, stats: RequestStats):
+        labels = (method, route)
+        with self._lock:
+            self.in_flight -= 1
+            key = labels + (str(status),)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.latency.setdefault(labels, Histogram()).observe(elapsed)
+            self.db_time.setdefault(labels, Histogram()).observe(stats.db_seconds)
+            self.db_queries[labels] = self.db_queries.get(labels, 0) + stats.queries
+
+    def statement_executed(self, elapsed: float):
+        with self._lock:
+            self.statements.observe(elapsed)
+
+    def render(self) -> str:
+        """Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            lines += [
+                "# HELP http_requests_in_flight Requests currently being served.",
+                "# TYPE http_requests_in_flight gauge",
+                f"http_requests_in_flight {self.in_flight}",
+                "# HELP http_requests_total Requests by route and status code.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route, status), value in sorted(self.requests.items()):
+                lines.append(f'http_requests_total{_labels(method=method, route=route, status=status)} {value}')
+            _render_histograms(
+                lines, "http_request_duration_seconds", "Request latency by route.", self.latency
+            )
+            _render_histograms(
+                lines, "http_request_db_seconds", "Time spent in SQL per request.", self.db_time
+            )
+            lines += [
+                "# HELP http_request_db_queries_total SQL statements executed by route.",
+                "# TYPE http_request_db_queries_total counter",
+            ]
+            for (method, route), value in sorted(self.db_queries.items()):
+                lines.append(f"http_request_db_queries_total{_labels(method=method, route=route)} {value}")
+            _render_histograms(
+                lines, "db_statement_duration_seconds", "Duration of every SQL statement.",
+                {(): self.statements},
+            )
+        return "\n".join(lines) + "\n"
+
+def _labels(**labels: str) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+def _render_histograms(lines: List[str], name: str, help_text: str, histograms: Dict[Labels, Histogram]):
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, histogram in sorted(histograms.items()):
+        base = dict(zip(("method", "route"), labels))
+        cumulative = 0
+        for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f"{name}_bucket{_labels(**base, le=le)} {cumulative}")
+        lines.append(f"{name}_sum{_labels(**base)} {histogram.sum}")
+        lines.append(f"{name}_count{_labels(**base)} {histogram.count}")
+
+metrics = MetricsRegistry()
+
+_instrumented: set = set()
+
+def instrument_engine(engine: Engine):
+    """Time every statement on ``engine`` and attribute it to the current request."""
+    if engine in _instrumented:
+        return
+    _instrumented.add(engine)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        metrics.statement_executed(elapsed)
+        for counter in _counters.get():
+            counter.record(statement, elapsed)
+        stats = _current.get()
+        if stats is not None:
+            stats.record(statement, elapsed)
+            if settings.QUERY_BUDGET_MODE == "raise":
+                budget = route_budget(stats.scope)
+                if budget is not None and stats.queries > budget:
+                    raise QueryBudgetExceeded(budget, stats, stats.scope["path"])
+
+# Query budgets: endpoints declare how many statements they may run, so a
+# dropped joinedload that turns into N+1 lazy loads fails loudly.
+
+class QueryBudgetExceeded(AssertionError):
+    def __init__(self, budget: int, stats: RequestStats, where: str = "block"):
+        self.budget = budget
+        self.stats = stats
+        super().__init__(
+            f"{where} ran {stats.queries} SQL statements, budget is {budget}:\n"
+            + format_statements(stats)
+        )
+
+def query_budget(max_queries: int) -> Callable:
+    """Declare the statement budget of an endpoint; checked by ``MetricsMiddleware``."""
+    def decorator(func):
+        func.query_budget = max_queries
+        return func
+    return decorator
+
+def route_budget(scope: Optional[dict]) -> Optional[int]:
+    route = scope.get("route") if scope else None
+    return getattr(getattr(route, "endpoint", None), "query_budget", None)
+
+def format_statements(stats: RequestStats) -> str:
+    lines = [
+        f"  {seconds * 1000:8.1f}ms  {' '.join(statement.split())}"
+        for statement, seconds in stats.statements
+    ]
+    omitted = stats.queries - len(stats.statements)
+    if omitted > 0:
+        lines.append(f"  ... {omitted} more")
+    return "\n".join(lines)
+
+@contextmanager
+def count_queries() -> Iterator[RequestStats]:
+    """
+    Count the statements run on the app's engines by the current context
+    while the block is open: this task or thread, plus the tasks and threads
+    it starts, which inherit the context - including requests made through
+    TestClient. Background tasks started before the block (like counter
+    flushes, hot ranking refreshes) are not counted.
+    """
+    from app.database.base import async_engine, engine
+
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+    counter = RequestStats()
+    token = _counters.set(_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _counters.reset(token)
+
+@contextmanager
+def assert_max_queries(max_queries: int) -> Iterator[RequestStats]:
+    """``count_queries`` that raises ``QueryBudgetExceeded`` when the block goes over."""
+    with count_queries() as counter:
+        yield counter
+    if counter.queries > max_queries:
+        raise QueryBudgetExceeded(max_queries, counter)
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, status codes, in-flight requests and
+    per-request SQL time. Routes are labelled by their path template, so
+    ``/posts/1`` and ``/posts/2`` share a series.
+    """
+
+    def __init__(self, app, slow_request_ms: float = settings.SLOW_REQUEST_MS):
+        self.app = app
+        self.slow_request_ms = slow_request_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = _current.set(stats)
+        status = 500
+        streaming = False
+        start = time.perf_counter()
+        metrics.request_started()
+
+        async def send_wrapper(message):
+            nonlocal status, streaming
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                # Event streams stay open by design; their duration isn't latency
+                streaming = any(
+                    name == b"content-type" and value.startswith(b"text/event-stream")
+                    for name, value in message.get("headers", ())
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current.reset(token)
+            # FastAPI puts the matched route in the scope; unmatched paths share one label
+            route = getattr(scope.get("route"), "path", "unmatched")
+            metrics.request_finished(scope["method"], route, status, elapsed, stats)
+            if self.slow_request_ms and elapsed * 1000 >= self.slow_request_ms and not streaming:
+                self.log_slow_request(scope, status, elapsed, stats)
+            if settings.QUERY_BUDGET_MODE == "log":
+                self.check_budget(scope, stats)
+
+    def log_slow_request(self, scope, status: int, elapsed: float, stats: RequestStats):
+        logger.warning(
+            "Slow request %s %s -> %d in %.1fms (%d queries, %.1fms in SQL)\n%s",
+            scope["method"], scope["path"], status, elapsed * 1000,
+            stats.queries, stats.db_seconds * 1000, format_statements(stats),
+        )
+
+    def check_budget(self, scope, stats: RequestStats):
+        budget = route_budget(scope)
+        if budget is not None and stats.queries > budget:
+            logger.warning(
+                "Query budget exceeded: %s %s ran %d statements, budget is %d\n%s",
+                scope["method"], scope["path"], stats.queries, budget, format_statements(stats),
+            )
@@ -0,0 +1,19 @@
+from typing import List
+
+from fastapi import HTTPException, Query
+
+from app.config import settings
+
+def parse_ids(
+    ids: str = Query(..., description="Comma-separated ids, e.g. 1,2,3"),
+) -> List[int]:
+    """``?ids=1,2,3`` as a list of ints, in request order (duplicates kept)."""
+    try:
+        parsed = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid ids")
+    if not parsed:
+        raise HTTPException(status_code=400, detail="Invalid ids")
+    if len(parsed) > settings.BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.BATCH_MAX_IDS} ids per request")
+    return parsed
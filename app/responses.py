@@ -0,0 +1,32 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# Optional speedup, stdlib json otherwise; other encoders import it from here
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response that skips FastAPI's ``jsonable_encoder`` pass.
+
+    * pydantic models render with ``model_dump_json`` (pydantic-core, no
+      intermediate dicts);
+    * ``bytes`` are taken as already-encoded JSON;
+    * anything else goes through orjson when installed, stdlib json otherwise.
+
+    Handlers that return one of these directly also bypass ``response_model``
+    re-validation, so build the response model yourself before wrapping it.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode()
+        if isinstance(content, bytes):
+            return content
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return super().render(content)
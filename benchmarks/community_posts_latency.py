@@ -0,0 +1,135 @@
+"""
+Concurrent GET /community/posts latency: blocking Session vs AsyncSession.
+
+Seeds a throwaway SQLite database, then fires concurrent requests at two
+in-process apps that serve the same endpoint:
+
+* ``before`` - the previous handler, an ``async def`` doing synchronous
+  ``Session`` work on the event loop;
+* ``after``  - ``app.community.router.list_posts`` on ``AsyncSession``.
+
+Keep ``--concurrency`` at or below the sync pool capacity (pool_size +
+max_overflow, 15 by default): past that, the ``before`` handler blocks the
+loop waiting for a pooled connection that can only be returned by the loop,
+and requests stall until the pool timeout.
+
+SQLite work is CPU bound, so the gap widens with available cores (reads run
+in parallel off the loop) and with I/O latency of the database.
+
+Usage:
+    pip install -r benchmarks/requirements.txt
+    python benchmarks/community_posts_latency.py --posts 20000 --concurrency 10 --requests 300
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=20000, help="number of seeded posts")
+    parser.add_argument("--concurrency", type=int, default=10, help="in-flight requests")
+    parser.add_argument("--requests", type=int, default=300, help="total requests per run")
+    parser.add_argument("--page-size", type=int, default=20)
+    return parser.parse_args()
+
+def seed(engine, posts: int):
+    from sqlalchemy import insert
+    from app.auth.models import User
+    from app.community.models import Post
+    from app.database.base import Base
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "email": f"user{i}@example.com", "username": f"user{i}", "hashed_password": "x"}
+            for i in range(1, 101)
+        ])
+        conn.execute(insert(Post), [
+            {"title": f"帖子 {i}", "content": "孕期经验分享 " * 20, "tags": ["孕期", "经验分享"],
+             "author_id": i % 100 + 1}
+            for i in range(posts)
+        ])
+
+def build_before_app():
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import desc
+    from sqlalchemy.orm import Session, joinedload
+    from app.community.models import Post
+    from app.community.schemas import PostFilter, PostList
+    from app.database.base import get_db
+
+    legacy = FastAPI()
+
+    @legacy.get("/community/posts", response_model=PostList)
+    async def list_posts(db: Session = Depends(get_db), filter_params: PostFilter = Depends()):
+        query = db.query(Post).outerjoin(Post.author).options(joinedload(Post.author))
+        total = query.count()
+        posts = query.order_by(desc(Post.created_at))\
+            .offset((filter_params.page - 1) * filter_params.page_size)\
+            .limit(filter_params.page_size)\
+            .all()
+        return PostList(total=total, posts=posts)
+
+    return legacy
+
+def build_after_app():
+    from fastapi import FastAPI
+    from app.community.router import router
+
+    current = FastAPI()
+    current.include_router(router)
+    return current
+
+async def run(app, args) -> list:
+    import httpx
+
+    latencies = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(i: int):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get("/community/posts", params={
+                    "page": i % 50 + 1, "page_size": args.page_size,
+                })
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        await asyncio.gather(*(one(i) for i in range(args.requests)))
+    return latencies
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def report(name: str, latencies: list, elapsed: float):
+    ms = [v * 1000 for v in latencies]
+    print(
+        f"{name:<8} n={len(ms):<5} rps={len(ms) / elapsed:8.1f} "
+        f"p50={statistics.median(ms):8.1f}ms p95={percentile(ms, 95):8.1f}ms p99={percentile(ms, 99):8.1f}ms"
+    )
+
+def main():
+    args = parse_args()
+    workdir = tempfile.mkdtemp(prefix="bumpcore-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+    from app.database.base import engine
+    seed(engine, args.posts)
+
+    for name, app in (("before", build_before_app()), ("after", build_after_app())):
+        start = time.perf_counter()
+        latencies = asyncio.run(run(app, args))
+        report(name, latencies, time.perf_counter() - start)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Throughput of GET /community/posts?page_size=100 under two serialization paths.
+
+Both apps run the same query (``app.community.router.query_posts``) against a
+throwaway SQLite database; only the trip from model to bytes differs:
+
+* ``before`` - the handler returns the model and FastAPI re-validates it
+  against ``response_model``, runs ``jsonable_encoder`` and ``json.dumps``;
+* ``after``  - the real route, which wraps the model in ``FastJSONResponse``
+  and renders it with ``model_dump_json``.
+
+Requests are issued sequentially in-process (httpx.ASGITransport), so the
+numbers are CPU per request with no network in the way.
+
+Usage:
+    pip install -r benchmarks/requirements.txt
+    python benchmarks/json_serialization.py --posts 5000 --requests 500
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=5000, help="number of seeded posts")
+    parser.add_argument("--requests", type=int, default=500, help="requests per run")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=3, help="alternating runs per app; best is reported")
+    return parser.parse_args()
+
+def seed(engine, posts: int):
+    from sqlalchemy import insert
+    from app.auth.models import User
+    from app.community.models import Post
+    from app.database.base import Base
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "email": f"user{i}@example.com", "username": f"user{i}", "hashed_password": "x"}
+            for i in range(1, 101)
+        ])
+        conn.execute(insert(Post), [
+            {"title": f"帖子 {i}", "content": "孕期经验分享 " * 40, "tags": ["孕期", "经验分享"],
+             "author_id": i % 100 + 1, "likes_count": i % 97, "comments_count": i % 13}
+            for i in range(posts)
+        ])
+
+def build_before_app():
+    from typing import Union
+    from fastapi import Depends, FastAPI
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from app.community.router import query_posts
+    from app.community.schemas import PostFilter, PostList, PostSummaryList
+    from app.database.base import get_async_db
+
+    legacy = FastAPI()
+
+    @legacy.get("/community/posts", response_model=Union[PostList, PostSummaryList])
+    async def list_posts(db: AsyncSession = Depends(get_async_db), filter_params: PostFilter = Depends()):
+        return await query_posts(db, filter_params)
+
+    return legacy
+
+def build_after_app():
+    from fastapi import FastAPI
+    from app.community.router import router
+    from app.responses import FastJSONResponse
+
+    current = FastAPI(default_response_class=FastJSONResponse)
+    current.include_router(router)
+    return current
+
+async def run(app, args) -> list:
+    import httpx
+
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for i in range(args.requests):
+            start = time.perf_counter()
+            response = await client.get("/community/posts", params={
+                "page": i % 20 + 1, "page_size": args.page_size,
+            })
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+    return latencies
+
+def main():
+    args = parse_args()
+    workdir = tempfile.mkdtemp(prefix="bumpcore-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+    from app.database.base import engine
+    seed(engine, args.posts)
+
+    apps = {"before": build_before_app(), "after": build_after_app()}
+    best = {}
+    for _ in range(args.rounds):
+        for name, app in apps.items():
+            start = time.perf_counter()
+            latencies = asyncio.run(run(app, args))
+            elapsed = time.perf_counter() - start
+            if name not in best or elapsed < best[name][0]:
+                best[name] = (elapsed, latencies)
+
+    for name, (elapsed, latencies) in best.items():
+        print(
+            f"{name:<8} rps={len(latencies) / elapsed:8.1f} "
+            f"mean={statistics.mean(latencies) * 1000:7.2f}ms p50={statistics.median(latencies) * 1000:7.2f}ms"
+        )
+    print(f"speedup  x{best['before'][0] / best['after'][0]:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+"""
+End-to-end load test: boots ``app.main:app`` under uvicorn against a seeded
+SQLite database and drives a weighted mix of workloads over HTTP.
+
+Workloads (``--mix name=weight,...``):
+
+* ``feed``    - GET /community/posts, latest and hot, random pages
+* ``search``  - GET /health/articles?search=<topic>
+* ``like``    - POST /community/posts/{hot post}/like, every user hammering one post
+* ``comment`` - POST /community/posts/{random post}/comments
+* ``login``   - POST /auth/login (bcrypt bound)
+
+``--concurrency`` virtual users run a closed loop for ``--duration`` seconds
+after a ``--warmup``. Throughput and p50/p95/p99 latency per workload go to a
+JSON report; ``compare`` diffs two reports.
+
+Usage:
+    pip install -r benchmarks/requirements.txt
+    python benchmarks/loadtest.py run --output before.json
+    # ... change something ...
+    python benchmarks/loadtest.py run --output after.json
+    python benchmarks/loadtest.py compare before.json after.json --fail-on-regression 10
+
+``run --url http://host:port`` targets a server that is already running
+(seeded with scripts/generate_load_data.py) instead of booting one.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MIX = "feed=50,search=20,like=15,comment=10,login=5"
+SEARCH_TERMS = ["孕吐", "胎动", "产检", "叶酸", "补钙", "待产包", "母乳喂养", "孕期运动", "失眠", "糖耐量"]
+# Users created by scripts/generate_load_data.py
+PASSWORD = "password123"
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="seed, boot the app and record a report")
+    run.add_argument("--url", help="target an already running server instead of booting one")
+    run.add_argument("--output", default="loadtest-report.json")
+    run.add_argument("--label", default="", help="free-form note stored in the report")
+    run.add_argument("--concurrency", type=int, default=20, help="virtual users")
+    run.add_argument("--duration", type=float, default=30, help="measured seconds")
+    run.add_argument("--warmup", type=float, default=5, help="unmeasured seconds before the run")
+    run.add_argument("--mix", default=DEFAULT_MIX, help="workload weights, e.g. feed=50,like=50")
+    run.add_argument("--seed", type=int, default=42)
+    seeding = run.add_argument_group("seeding (ignored with --url)")
+    seeding.add_argument("--users", type=int, default=1000)
+    seeding.add_argument("--posts", type=int, default=20000)
+    seeding.add_argument("--comments", type=int, default=100000)
+    seeding.add_argument("--likes", type=int, default=200000)
+    seeding.add_argument("--articles", type=int, default=2000)
+    seeding.add_argument("--server-workers", type=int, default=1, help="uvicorn worker processes")
+
+    compare = commands.add_parser("compare", help="diff two reports")
+    compare.add_argument("base")
+    compare.add_argument("new")
+    compare.add_argument(
+        "--fail-on-regression", type=float, metavar="PCT",
+        help="exit 1 if any workload loses more than PCT%% throughput or gains it in p95",
+    )
+    return parser.parse_args()
+
+# --- server ----------------------------------------------------------------
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def seed_database(args, workdir: str) -> dict:
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'loadtest.db')}")
+    subprocess.run(
+        [
+            sys.executable, os.path.join(ROOT, "scripts", "generate_load_data.py"),
+            "--users", str(args.users), "--posts", str(args.posts), "--comments", str(args.comments),
+            "--likes", str(args.likes), "--articles", str(args.articles), "--seed", str(args.seed),
+        ],
+        check=True, cwd=workdir, env=env, stdout=subprocess.DEVNULL,
+    )
+    subprocess.run(
+        [sys.executable, os.path.join(ROOT, "scripts", "refresh_hot_scores.py")],
+        check=True, cwd=workdir, env=env, stdout=subprocess.DEVNULL,
+    )
+    return env
+
+def start_server(env: dict, workdir: str, workers: int):
+    port = free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+        ],
+        # Slow-request logging would flood the console under load; export SLOW_REQUEST_MS to keep it
+        cwd=workdir, env=dict({"SLOW_REQUEST_MS": "0"}, **env, PYTHONPATH=ROOT),
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return server, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("server did not start within 60s")
+
+# --- workloads -------------------------------------------------------------
+
+class Context:
+    """State shared by virtual users: ids discovered at setup, one token per user."""
+
+    def __init__(self, hot_post: int, max_post: int, users: list):
+        self.hot_post = hot_post
+        self.max_post = max_post
+        self.users = users
+
+async def setup_context(client, concurrency: int) -> Context:
+    latest = (await client.get("/api/v1/community/posts", params={"page_size": 1})).json()
+    hot = (await client.get("/api/v1/community/posts", params={"page_size": 1, "sort": "hot"})).json()
+    if not latest["posts"]:
+        raise RuntimeError("database has no posts; seed it with scripts/generate_load_data.py")
+    max_post = latest["posts"][0]["id"]
+    hot_post = (hot["posts"] or latest["posts"])[0]["id"]
+
+    async def login(n: int):
+        email = f"loadtest{n}@example.com"
+        response = await client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+        response.raise_for_status()
+        return {"email": email, "token": response.json()["access_token"]}
+
+    users = await asyncio.gather(*(login(n) for n in range(1, concurrency + 1)))
+    return Context(hot_post, max_post, list(users))
+
+async def feed(client, ctx: Context, user: dict, rng: random.Random):
+    params = {"page": rng.randint(1, 20), "page_size": 20}
+    if rng.random() < 0.3:
+        params["sort"] = "hot"
+    return await client.get("/api/v1/community/posts", params=params)
+
+async def search(client, ctx: Context, user: dict, rng: random.Random):
+    return await client.get("/api/v1/health/articles", params={"search": rng.choice(SEARCH_TERMS)})
+
+async def like(client, ctx: Context, user: dict, rng: random.Random):
+    return await client.post(
+        f"/api/v1/community/posts/{ctx.hot_post}/like",
+        headers={"Authorization": f"Bearer {user['token']}"},
+    )
+
+async def comment(client, ctx: Context, user: dict, rng: random.Random):
+    post_id = rng.randint(1, ctx.max_post)
+    return await client.post(
+        f"/api/v1/community/posts/{post_id}/comments",
+        json={"content": "压测评论", "post_id": post_id},
+        headers={"Authorization": f"Bearer {user['token']}"},
+    )
+
+async def login(client, ctx: Context, user: dict, rng: random.Random):
+    return await client.post("/api/v1/auth/login", json={"email": user["email"], "password": PASSWORD})
+
+WORKLOADS = {"feed": feed, "search": search, "like": like, "comment": comment, "login": login}
+
+def parse_mix(mix: str) -> dict:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in WORKLOADS:
+            raise SystemExit(f"unknown workload '{name}', choose from {', '.join(WORKLOADS)}")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+async def drive(base_url: str, args) -> dict:
+    import httpx
+
+    weights = parse_mix(args.mix)
+    names, cumulative = list(weights), []
+    for name in names:
+        cumulative.append((cumulative[-1] if cumulative else 0) + weights[name])
+
+    samples = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        ctx = await setup_context(client, args.concurrency)
+        start = time.perf_counter()
+        measure_from = start + args.warmup
+        stop_at = measure_from + args.duration
+
+        async def virtual_user(index: int):
+            rng = random.Random(args.seed * 1000 + index)
+            user = ctx.users[index]
+            while True:
+                name = rng.choices(names, cum_weights=cumulative)[0]
+                sent = time.perf_counter()
+                if sent >= stop_at:
+                    return
+                try:
+                    response = await WORKLOADS[name](client, ctx, user, rng)
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                if sent >= measure_from:
+                    samples[name].append(time.perf_counter() - sent)
+                    if not ok:
+                        errors[name] += 1
+
+        await asyncio.gather(*(virtual_user(i) for i in range(args.concurrency)))
+
+    workloads = {name: summarize(samples[name], errors[name], args.duration) for name in names}
+    every = [latency for name in names for latency in samples[name]]
+    return {
+        "workloads": workloads,
+        "total": summarize(every, sum(errors.values()), args.duration),
+    }
+
+# --- reporting -------------------------------------------------------------
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize(latencies: list, errors: int, duration: float) -> dict:
+    if not latencies:
+        return {"requests": 0, "errors": errors, "rps": 0.0}
+    ms = [value * 1000 for value in latencies]
+    return {
+        "requests": len(ms),
+        "errors": errors,
+        "rps": round(len(ms) / duration, 2),
+        "mean_ms": round(statistics.mean(ms), 2),
+        "p50_ms": round(percentile(ms, 50), 2),
+        "p95_ms": round(percentile(ms, 95), 2),
+        "p99_ms": round(percentile(ms, 99), 2),
+        "max_ms": round(max(ms), 2),
+    }
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def print_report(report: dict):
+    print(f"{'workload':<10}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    rows = list(report["workloads"].items()) + [("total", report["total"])]
+    for name, stats in rows:
+        print(
+            f"{name:<10}{stats['requests']:>10}{stats['errors']:>8}{stats['rps']:>10.1f}"
+            f"{stats.get('p50_ms', 0):>10.1f}{stats.get('p95_ms', 0):>10.1f}{stats.get('p99_ms', 0):>10.1f}"
+        )
+
+def run(args):
+    server = None
+    workdir = tempfile.mkdtemp(prefix="bumpcore-loadtest-")
+    try:
+        if args.url:
+            base_url = args.url.rstrip("/")
+        else:
+            print(f"seeding {workdir} ...")
+            env = seed_database(args, workdir)
+            server, base_url = start_server(env, workdir, args.server_workers)
+        print(f"driving {base_url} for {args.warmup:g}s warmup + {args.duration:g}s ...")
+        results = asyncio.run(drive(base_url, args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    report = {
+        "meta": {
+            "label": args.label,
+            "revision": git_revision(),
+            "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "config": {
+                key: value for key, value in vars(args).items() if key not in ("command", "output")
+            },
+        },
+        **results,
+    }
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, ensure_ascii=False, indent=2)
+    print_report(report)
+    print(f"report written to {args.output}")
+
+def change(base: float, new: float) -> float:
+    return (new - base) / base * 100 if base else 0.0
+
+def compare(args) -> int:
+    with open(args.base, encoding="utf-8") as fh:
+        base = json.load(fh)
+    with open(args.new, encoding="utf-8") as fh:
+        new = json.load(fh)
+    print(f"base: {base['meta']['revision']} {base['meta']['label']}")
+    print(f"new:  {new['meta']['revision']} {new['meta']['label']}")
+    print(f"{'workload':<10}{'rps':>22}{'p50 ms':>22}{'p95 ms':>22}{'p99 ms':>22}")
+
+    regressions = []
+    names = [name for name in base["workloads"] if name in new["workloads"]] + ["total"]
+    for name in names:
+        old_stats = base["total"] if name == "total" else base["workloads"][name]
+        new_stats = new["total"] if name == "total" else new["workloads"][name]
+        cells = []
+        for key in ("rps", "p50_ms", "p95_ms", "p99_ms"):
+            old_value, new_value = old_stats.get(key, 0), new_stats.get(key, 0)
+            delta = change(old_value, new_value)
+            cells.append(f"{old_value:>8.1f} -> {new_value:>7.1f} {delta:>+5.0f}%")
+        print(f"{name:<10}" + "".join(f"{cell:>22}" for cell in cells))
+
+        if args.fail_on_regression is not None and name != "total":
+            if change(old_stats.get("rps", 0), new_stats.get("rps", 0)) < -args.fail_on_regression:
+                regressions.append(f"{name} throughput")
+            if change(old_stats.get("p95_ms", 0), new_stats.get("p95_ms", 0)) > args.fail_on_regression:
+                regressions.append(f"{name} p95 latency")
+
+    if regressions:
+        print("regressed beyond threshold: " + ", ".join(regressions))
+        return 1
+    return 0
+
+def main():
+    args = parse_args()
+    if args.command == "compare":
+        sys.exit(compare(args))
+    run(args)
+
+if __name__ == "__main__":
+    main()
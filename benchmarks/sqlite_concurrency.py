@@ -0,0 +1,139 @@
+"""
+SQLite read/write concurrency: stock engine vs the tuned engine from
+app.database.base (WAL, synchronous=NORMAL, busy_timeout, mmap, cache).
+
+Each run seeds a fresh database, then runs reader threads paging the feed
+query next to writer threads toggling likes (insert + counter update, one
+transaction each) for a fixed duration.
+
+Usage:
+    python benchmarks/sqlite_concurrency.py --readers 4 --writers 2 --seconds 10
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.exc import OperationalError
+
+from app.auth.models import User
+from app.community.models import Post
+from app.database.base import Base, configure_engine
+
+FEED_QUERY = text(
+    "SELECT posts.*, users.username FROM posts JOIN users ON users.id = posts.author_id "
+    "ORDER BY posts.created_at DESC, posts.id DESC LIMIT 20 OFFSET :offset"
+)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=20000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=10)
+    return parser.parse_args()
+
+def build_engine(path: str, tuned: bool):
+    url = f"sqlite:///{path}"
+    engine = create_engine(url, connect_args={"check_same_thread": False}, pool_size=16)
+    if tuned:
+        configure_engine(engine, url)
+    return engine
+
+def seed(engine, posts: int):
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "email": f"user{i}@example.com", "username": f"user{i}", "hashed_password": "x"}
+            for i in range(1, 1001)
+        ])
+        conn.execute(insert(Post), [
+            {"title": f"帖子 {i}", "content": "孕期经验分享 " * 20, "tags": ["孕期"], "author_id": i % 1000 + 1}
+            for i in range(posts)
+        ])
+
+def run(engine, args) -> dict:
+    stop = time.perf_counter() + args.seconds
+    read_latencies, write_latencies = [], []
+    errors = []
+    lock = threading.Lock()
+
+    def reader(n: int):
+        offset = n
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            try:
+                with engine.connect() as conn:
+                    conn.execute(FEED_QUERY, {"offset": offset % 500}).all()
+            except OperationalError as exc:
+                with lock:
+                    errors.append(str(exc.orig))
+                continue
+            with lock:
+                read_latencies.append(time.perf_counter() - start)
+            offset += 20
+
+    def writer(n: int):
+        user_id = n * 100000
+        while time.perf_counter() < stop:
+            user_id += 1
+            post_id = user_id % args.posts + 1
+            start = time.perf_counter()
+            try:
+                with engine.begin() as conn:
+                    conn.execute(
+                        text("INSERT INTO post_likes (post_id, user_id) VALUES (:post_id, :user_id)"),
+                        {"post_id": post_id, "user_id": user_id},
+                    )
+                    conn.execute(
+                        text("UPDATE posts SET likes_count = likes_count + 1 WHERE id = :post_id"),
+                        {"post_id": post_id},
+                    )
+            except OperationalError as exc:
+                with lock:
+                    errors.append(str(exc.orig))
+                continue
+            with lock:
+                write_latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {"reads": read_latencies, "writes": write_latencies, "errors": errors}
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def report(name: str, result: dict, seconds: float):
+    for kind in ("reads", "writes"):
+        ms = [v * 1000 for v in result[kind]]
+        print(
+            f"{name:<8} {kind:<6} ops/s={len(ms) / seconds:8.1f} "
+            f"p50={statistics.median(ms) if ms else float('nan'):8.1f}ms p99={percentile(ms, 99):8.1f}ms"
+        )
+    print(f"{name:<8} errors={len(result['errors'])} {sorted(set(result['errors']))[:3]}")
+
+def main():
+    args = parse_args()
+    workdir = tempfile.mkdtemp(prefix="bumpcore-bench-")
+    for name, tuned in (("stock", False), ("tuned", True)):
+        engine = build_engine(os.path.join(workdir, f"{name}.db"), tuned)
+        seed(engine, args.posts)
+        report(name, run(engine, args), args.seconds)
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
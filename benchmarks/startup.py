@@ -0,0 +1,118 @@
+"""
+Cold start of the API, checked against a budget.
+
+Measures, each in fresh interpreters:
+
+* ``import``  - ``import app.main`` (must not touch the database);
+* ``serve``   - spawning a uvicorn worker until ``GET /`` answers, with the
+  schema created beforehand by scripts/init_db.py and
+  ``DB_CREATE_SCHEMA_ON_STARTUP=false`` as in production.
+
+It also fails if modules that should load lazily (crypto for JWT and
+bcrypt) are imported by ``app.main``. Exits 1 when over budget, so CI can
+track regressions.
+
+Usage:
+    python benchmarks/startup.py --runs 5 --budget-ms 1500
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on first login / token check, never at import
+LAZY_MODULES = ("jose", "passlib", "bcrypt", "cryptography")
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (LAZY_MODULES,)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500, help="median budget for serve")
+    parser.add_argument("--import-budget-ms", type=float, default=1000, help="median budget for import")
+    return parser.parse_args()
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def measure_import(env: dict) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def measure_serve(env: dict) -> float:
+    import httpx
+
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    try:
+        deadline = start + 60
+        while time.perf_counter() < deadline:
+            if server.poll() is not None:
+                raise RuntimeError("server exited during startup")
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/", timeout=0.5).status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.HTTPError:
+                time.sleep(0.01)
+        raise RuntimeError("server did not answer within 60s")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+def main():
+    args = parse_args()
+    workdir = tempfile.mkdtemp(prefix="bumpcore-startup-")
+    env = dict(
+        os.environ,
+        PYTHONPATH=ROOT,
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'startup.db')}",
+        DB_CREATE_SCHEMA_ON_STARTUP="false",
+    )
+    subprocess.run(
+        [sys.executable, os.path.join(ROOT, "scripts", "init_db.py")],
+        check=True, env=env, stdout=subprocess.DEVNULL,
+    )
+
+    imports = [measure_import(env) for _ in range(args.runs)]
+    serves = [measure_serve(env) for _ in range(args.runs)]
+    import_ms = statistics.median(run["seconds"] for run in imports) * 1000
+    serve_ms = statistics.median(serves) * 1000
+    loaded = sorted({module for run in imports for module in run["loaded"]})
+
+    print(f"import app.main  median {import_ms:7.1f}ms  (budget {args.import_budget_ms:g}ms)")
+    print(f"worker to first  median {serve_ms:7.1f}ms  (budget {args.budget_ms:g}ms)")
+    failures = []
+    if import_ms > args.import_budget_ms:
+        failures.append("import over budget")
+    if serve_ms > args.budget_ms:
+        failures.append("serve over budget")
+    if loaded:
+        failures.append("eagerly imported: " + ", ".join(loaded))
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print("OK")
+
+if __name__ == "__main__":
+    main()
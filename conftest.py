@@ -0,0 +1,71 @@
+import importlib.util
+import os
+import tempfile
+
+# The app reads its settings at import time, so point it at a scratch database first
+_tmp_dir = tempfile.mkdtemp(prefix="bumpbuddy-test-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmp_dir, 'test.db')}")
+os.environ.setdefault("HOT_RANKING_LOCK_FILE", os.path.join(_tmp_dir, "hot_ranking.lock"))
+os.environ.setdefault("HOT_RANKING_ROLE", "writer")
+os.environ.setdefault("QUERY_BUDGET_MODE", "raise")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.auth.principal import principal_cache
+from app.community.cache import liked_cache, post_count_cache
+from app.database.base import Base, engine
+from app.health.cache import article_cache, invalidate_articles
+from app.main import app
+from app.metrics import assert_max_queries, count_queries
+
+@pytest.fixture
+def client():
+    """Client over an empty database; the app's lifespan runs around each test."""
+    Base.metadata.drop_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS health_articles_fts"))
+    for cache in (principal_cache, post_count_cache, liked_cache, article_cache):
+        cache.clear()
+    invalidate_articles()
+    with TestClient(app) as c:
+        yield c
+
+@pytest.fixture
+def auth_headers(client):
+    """Register a user and return the Authorization header for their token."""
+    def make(email: str = "mom@example.com") -> dict:
+        user = {"email": email, "username": email.split("@")[0], "password": "secret123"}
+        assert client.post("/api/v1/auth/register", json=user).status_code == 200
+        response = client.post("/api/v1/auth/login", json={"email": email, "password": "secret123"})
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return make
+
+@pytest.fixture
+def load_script():
+    """Import one of the scripts/ modules by name."""
+    def load(name: str):
+        path = os.path.join(os.path.dirname(__file__), "scripts", f"{name}.py")
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    return load
+
+@pytest.fixture
+def query_budget():
+    """
+    Fail the block when it runs more SQL statements than allowed::
+
+        def test_list_posts(client, query_budget):
+            with query_budget(2):
+                client.get("/api/v1/community/posts")
+    """
+    return assert_max_queries
+
+@pytest.fixture
+def query_counter():
+    """Open counter over the whole test; inspect ``.queries`` and ``.statements``."""
+    with count_queries() as counter:
+        yield counter
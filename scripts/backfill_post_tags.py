@@ -0,0 +1,70 @@
+"""
+回填 post_tags 表：把 posts.tags（JSON 数组）展开为逐行的标签记录。
+
+按 id 分批处理，每批一个事务；对每批帖子先删除旧的标签行再重新写入，
+因此可以重复执行。
+
+用法：
+    python scripts/backfill_post_tags.py [--batch-size 1000]
+"""
+import argparse
+import json
+import os
+import sys
+
+# 获取项目根目录
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root_dir)
+
+from sqlalchemy import delete, insert, select
+
+from app.community.models import Post, PostTag, normalize_tags
+from app.database.base import engine
+
+def parse_tags(raw) -> list:
+    # Rows written by older scripts may hold the JSON text instead of a list
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            return []
+    return normalize_tags(raw if isinstance(raw, list) else [])
+
+def backfill(batch_size: int) -> int:
+    PostTag.__table__.create(bind=engine, checkfirst=True)
+    last_id = 0
+    total = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(Post.id, Post.tags)
+                .where(Post.id > last_id)
+                .order_by(Post.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            post_ids = [row.id for row in rows]
+            tag_rows = [
+                {"post_id": row.id, "tag": tag}
+                for row in rows
+                for tag in parse_tags(row.tags)
+            ]
+            conn.execute(delete(PostTag).where(PostTag.post_id.in_(post_ids)))
+            if tag_rows:
+                conn.execute(insert(PostTag), tag_rows)
+        last_id = post_ids[-1]
+        total += len(rows)
+        print(f"已处理 {total} 条帖子（id <= {last_id}）")
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill post_tags from posts.tags")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    total = backfill(args.batch_size)
+    print(f"标签回填完成，共 {total} 条帖子。")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import os
 import sys
 import sqlite3
+import json
 from datetime import datetime
 from passlib.context import CryptContext
 
@@ -37,9 +38,15 @@ def create_tables(conn):
         category TEXT,
         tags TEXT,
         author TEXT,
-        created_at TEXT
+        created_at DATETIME
     )
     ''')
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS ix_health_articles_category_created_at ON health_articles (category, created_at)
+    ''')
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS ix_health_articles_created_at_id ON health_articles (created_at, id)
+    ''')
     
     # 创建社区帖子表
     cursor.execute('''
@@ -53,6 +60,7 @@ def create_tables(conn):
         likes_count INTEGER DEFAULT 0,
         comments_count INTEGER DEFAULT 0,
         is_hot BOOLEAN DEFAULT FALSE,
+        hot_score FLOAT DEFAULT 0,
         created_at DATETIME,
         updated_at DATETIME,
         FOREIGN KEY(author_id) REFERENCES users(id)
@@ -85,6 +93,20 @@ def create_tables(conn):
     )
     ''')
     
+    # 创建帖子标签表（用于按标签筛选）
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS post_tags (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        post_id INTEGER NOT NULL,
+        tag TEXT NOT NULL,
+        FOREIGN KEY(post_id) REFERENCES posts(id) ON DELETE CASCADE,
+        UNIQUE(post_id, tag)
+    )
+    ''')
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS ix_post_tags_tag_post_id ON post_tags (tag, post_id)
+    ''')
+    
     conn.commit()
 
 def insert_test_data(conn):
@@ -409,7 +431,8 @@ def insert_test_data(conn):
             article["category"],
             article["tags"],
             article["author"],
-            article["created_at"]
+            # 与 SQLAlchemy 的 DateTime 存储格式一致，保证按字符串排序即按时间排序
+            datetime.fromisoformat(article["created_at"]).strftime("%Y-%m-%d %H:%M:%S.%f")
         ))
     
     # Get user IDs from the database
@@ -470,6 +493,12 @@ def insert_test_data(conn):
             post["created_at"],
             post["created_at"]  # Initially same as created_at
         ))
+        post_id = cursor.lastrowid
+        cursor.execute("DELETE FROM post_tags WHERE post_id = ?", (post_id,))
+        cursor.executemany(
+            "INSERT INTO post_tags (post_id, tag) VALUES (?, ?)",
+            [(post_id, tag) for tag in json.loads(post["tags"])]
+        )
     
     # Get post IDs from the database for comments
     cursor.execute("SELECT id FROM posts LIMIT 3")
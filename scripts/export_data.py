@@ -0,0 +1,61 @@
+"""
+导出帖子、评论或健康文章为 NDJSON / CSV，供数据分析使用。
+
+使用服务端游标（stream_results + yield_per）逐批读取并写出，内存占用与表大小无关；
+按创建时间升序输出，--since 只导出该时间（含）之后创建的记录，用于增量拉取
+（边界上同一时间的记录可能重复，按 id 去重即可）。
+接口 GET /api/v1/community/posts/export 等使用同样的查询和格式。
+
+用法：
+    python scripts/export_data.py posts --format csv -o posts.csv
+    python scripts/export_data.py comments --since 2024-06-01T00:00:00 > comments.ndjson
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+# 获取项目根目录
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root_dir)
+
+from app.config import settings
+from app.database.base import engine
+from app.community.export import comments_export, posts_export
+from app.export import ExportFormat, csv_header, encode_rows
+from app.health.utils import articles_export
+
+EXPORTS = {"posts": posts_export, "comments": comments_export, "articles": articles_export}
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream posts, comments or articles to NDJSON/CSV")
+    parser.add_argument("table", choices=sorted(EXPORTS))
+    parser.add_argument("--format", choices=[fmt.value for fmt in ExportFormat], default=ExportFormat.NDJSON.value)
+    parser.add_argument("--since", type=datetime.fromisoformat, help="ISO time, inclusive")
+    parser.add_argument("--batch-size", type=int, default=settings.EXPORT_BATCH_SIZE)
+    parser.add_argument("-o", "--output", help="Output file, stdout by default")
+    args = parser.parse_args()
+
+    fmt = ExportFormat(args.format)
+    query = EXPORTS[args.table](args.since)
+    columns = [column.key for column in query.selected_columns]
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    start = time.perf_counter()
+    count = 0
+    try:
+        if fmt == ExportFormat.CSV:
+            output.write(csv_header(columns))
+        with engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=args.batch_size).execute(query)
+            for rows in result.partitions():
+                output.write(encode_rows(rows, columns, fmt))
+                count += len(rows)
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+    # 进度信息写到 stderr，避免混入标准输出的数据
+    print(f"导出完成：{args.table} 共 {count} 行，用时 {time.perf_counter() - start:.1f} 秒", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+生成压测用的大规模模拟数据：用户、帖子（含 post_tags）、评论、点赞和健康文章。
+
+- 帖子的热度服从 Zipf 分布：少数帖子获得大部分点赞和评论；
+- 标签和中文正文由常见孕期话题随机组合而成；
+- 所有用户共用一个预先计算好的 bcrypt 哈希（默认密码 password123），
+  不会为每一行调用 bcrypt；
+- 按批次 executemany 写入，每批一个事务；likes_count / comments_count
+  与生成的点赞、评论行严格一致；
+- --workers 大于 1 时按帖子区间分给多个进程并行生成和写入
+  （SQLite 同一时间只有一个写者，并行主要节省生成数据的 CPU 时间）。
+
+数据追加到现有数据库中，用户和帖子 id 接在当前最大 id 之后。
+生成完成后可执行 scripts/refresh_hot_scores.py 计算热帖分数。
+
+用法：
+    python scripts/generate_load_data.py --users 10000 --posts 1000000 \\
+        --comments 5000000 --likes 20000000 --workers 4
+"""
+import argparse
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+# 获取项目根目录
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root_dir)
+
+from sqlalchemy import func, insert, select
+
+from app.auth.models import User
+from app.community.models import Comment, Post, PostLike, PostTag, PostType
+from app.database.base import engine
+from app.database.schema import init_database
+from app.health.models import HealthArticle
+from app.health.search import get_search_backend
+
+TOPICS = [
+    "孕早期", "孕中期", "孕晚期", "产检", "唐筛", "NT检查", "四维彩超", "糖耐量",
+    "孕吐", "胎动", "胎心", "宫缩", "水肿", "失眠", "腰酸", "便秘",
+    "叶酸", "补钙", "补铁", "DHA", "饮食", "体重管理", "孕期运动", "瑜伽",
+    "待产包", "顺产", "剖宫产", "无痛分娩", "坐月子", "母乳喂养", "新生儿护理", "产后恢复",
+]
+SUBJECTS = ["我", "老公", "医生", "婆婆", "闺蜜", "宝宝", "产科护士", "营养师"]
+PHRASES = [
+    "今天去医院做了{topic}", "最近总是担心{topic}的问题", "想请教一下大家关于{topic}的经验",
+    "{subject}说{topic}要特别注意", "第一次经历{topic}有点紧张", "查了很多资料还是不太懂{topic}",
+    "分享一下我的{topic}心得", "{topic}之后感觉好多了", "{subject}建议多休息，{topic}不用太焦虑",
+    "有没有姐妹也在准备{topic}", "{topic}的时候一定要放松心情", "记录一下{topic}的全过程",
+]
+ENDINGS = ["。", "！", "？", "……", "，希望对大家有帮助。", "，谢谢大家！"]
+REPLIES = [
+    "同感", "谢谢分享", "我也是这样", "加油", "学到了", "我当时也很紧张", "建议问问医生",
+    "抱抱", "好有用", "收藏了", "宝宝一定健康", "和我情况一样",
+]
+CATEGORIES = ["营养", "运动", "心理", "产检", "分娩", "育儿", "胎教"]
+POST_TYPES = [PostType.GENERAL, PostType.QUESTION, PostType.EXPERIENCE]
+
+def zipf_weights(count: int, exponent: float) -> list:
+    # 按排名 1..count 的 Zipf 权重，前几个话题最常见
+    return [1 / rank ** exponent for rank in range(1, count + 1)]
+
+TOPIC_WEIGHTS = zipf_weights(len(TOPICS), 1.0)
+
+def sentence(rng: random.Random) -> str:
+    phrase = rng.choice(PHRASES).format(
+        topic=rng.choices(TOPICS, TOPIC_WEIGHTS)[0], subject=rng.choice(SUBJECTS)
+    )
+    return phrase + rng.choice(ENDINGS)
+
+def paragraph(rng: random.Random, sentences: int) -> str:
+    return "".join(sentence(rng) for _ in range(sentences))
+
+class Plan:
+    """生成参数；按值传给子进程。"""
+
+    def __init__(self, args, user_base: int, post_base: int, password_hash: str, now: datetime):
+        self.seed = args.seed
+        self.users = args.users
+        self.posts = args.posts
+        self.comments = args.comments
+        self.likes = args.likes
+        self.exponent = args.zipf
+        self.days = args.days
+        self.batch_size = args.batch_size
+        self.user_base = user_base
+        self.post_base = post_base
+        self.password_hash = password_hash
+        self.now = now
+        self.start = now - timedelta(days=args.days)
+        # 广义调和数，用于把 Zipf 权重归一化
+        self.harmonic = sum(1 / rank ** args.zipf for rank in range(1, args.posts + 1))
+        # 线性同余置换：把帖子序号映射为热度排名，使热门帖子分散在整个 id 区间
+        multiplier = 7919
+        while math.gcd(multiplier, args.posts) != 1:
+            multiplier += 2
+        self.multiplier = multiplier
+
+    def rank(self, index: int) -> int:
+        return (index * self.multiplier + self.seed) % self.posts + 1
+
+    def expected(self, index: int, total: int) -> float:
+        return total * self.rank(index) ** -self.exponent / self.harmonic
+
+def draw(rng: random.Random, expected: float) -> int:
+    # 期望值的整数部分加一次伯努利试验，总量与目标基本一致
+    whole = int(expected)
+    return whole + (rng.random() < expected - whole)
+
+def insert_users(plan: Plan):
+    for start in range(0, plan.users, plan.batch_size):
+        end = min(start + plan.batch_size, plan.users)
+        rows = [
+            {
+                "id": plan.user_base + n,
+                "email": f"loadtest{plan.user_base + n}@example.com",
+                "username": f"loadtest{plan.user_base + n}",
+                "hashed_password": plan.password_hash,
+                "is_active": True,
+                "created_at": plan.start,
+            }
+            for n in range(start + 1, end + 1)
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(User), rows)
+
+def generate_chunk(plan: Plan, start: int, end: int) -> dict:
+    """生成并写入帖子序号 [start, end) 及其标签、评论、点赞。"""
+    rng = random.Random(plan.seed * 1_000_003 + start)
+    span = (plan.now - plan.start).total_seconds()
+    posts, tags, comments, likes = [], [], [], []
+    for index in range(start, end):
+        post_id = plan.post_base + index + 1
+        # 帖子按 id 递增分布在时间窗口内
+        created_at = plan.start + timedelta(seconds=span * (index + rng.random()) / plan.posts)
+        post_tags = sorted(set(rng.choices(TOPICS, TOPIC_WEIGHTS, k=rng.randint(1, 3))))
+        like_count = min(draw(rng, plan.expected(index, plan.likes)), plan.users)
+        comment_count = draw(rng, plan.expected(index, plan.comments))
+        posts.append({
+            "id": post_id,
+            "title": sentence(rng)[:60],
+            "content": paragraph(rng, rng.randint(2, 12)),
+            "type": rng.choice(POST_TYPES),
+            "tags": post_tags,
+            "author_id": plan.user_base + rng.randint(1, plan.users),
+            "likes_count": like_count,
+            "comments_count": comment_count,
+            "is_hot": False,
+            "hot_score": 0.0,
+            "created_at": created_at,
+            "updated_at": created_at,
+        })
+        tags.extend({"post_id": post_id, "tag": tag} for tag in post_tags)
+        # 评论和点赞发生在发帖后的一周内（不晚于现在）
+        window = max(1.0, min(7 * 86400, (plan.now - created_at).total_seconds()))
+        for _ in range(comment_count):
+            comments.append({
+                "content": rng.choice(REPLIES) + rng.choice(ENDINGS),
+                "post_id": post_id,
+                "author_id": plan.user_base + rng.randint(1, plan.users),
+                "created_at": created_at + timedelta(seconds=rng.random() * window),
+            })
+        for user in rng.sample(range(1, plan.users + 1), like_count):
+            likes.append({
+                "post_id": post_id,
+                "user_id": plan.user_base + user,
+                "created_at": created_at + timedelta(seconds=rng.random() * window),
+            })
+
+    with engine.begin() as conn:
+        conn.execute(insert(Post), posts)
+        if tags:
+            conn.execute(insert(PostTag), tags)
+        for table, rows in ((Comment, comments), (PostLike, likes)):
+            for offset in range(0, len(rows), plan.batch_size):
+                conn.execute(insert(table), rows[offset:offset + plan.batch_size])
+    return {"posts": len(posts), "post_tags": len(tags), "comments": len(comments), "likes": len(likes)}
+
+def _run_chunk(task):
+    plan, start, end = task
+    return generate_chunk(plan, start, end)
+
+def _init_worker():
+    # fork 继承的连接不能跨进程使用
+    engine.dispose(close=False)
+
+def insert_articles(count: int, seed: int, batch_size: int, now: datetime) -> int:
+    rng = random.Random(seed)
+    for start in range(0, count, batch_size):
+        rows = []
+        for _ in range(min(batch_size, count - start)):
+            topics = rng.sample(TOPICS, 3)
+            rows.append({
+                "title": f"{topics[0]}指南：{sentence(rng)[:30]}",
+                "content": "\n\n".join(paragraph(rng, rng.randint(4, 10)) for _ in range(rng.randint(3, 8))),
+                "category": rng.choice(CATEGORIES),
+                "tags": ",".join(topics),
+                "author": f"{rng.choice(['妇产科', '营养科', '儿科', '心理科'])}专家",
+                "created_at": now - timedelta(seconds=rng.random() * 365 * 86400),
+            })
+        with engine.begin() as conn:
+            conn.execute(insert(HealthArticle), rows)
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic data for load testing")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--posts", type=int, default=100000)
+    parser.add_argument("--comments", type=int, default=500000, help="Target total, spread by Zipf popularity")
+    parser.add_argument("--likes", type=int, default=2000000, help="Target total, capped at --users per post")
+    parser.add_argument("--articles", type=int, default=1000)
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent of post popularity")
+    parser.add_argument("--days", type=int, default=365, help="Spread post creation over this many days")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Posts per transaction, rows per executemany")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--password", default="password123", help="Password shared by every generated user")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    init_database(engine)
+    with engine.connect() as conn:
+        user_base = conn.scalar(select(func.coalesce(func.max(User.id), 0)))
+        post_base = conn.scalar(select(func.coalesce(func.max(Post.id), 0)))
+
+    # 只计算一次 bcrypt
+    from app.auth.hashing import pwd_context
+    plan = Plan(args, user_base, post_base, pwd_context.hash(args.password), datetime.utcnow())
+
+    started = time.perf_counter()
+    insert_users(plan)
+    print(f"已写入 {args.users} 个用户（id {user_base + 1} - {user_base + args.users}）")
+
+    totals = {"posts": 0, "post_tags": 0, "comments": 0, "likes": 0}
+    tasks = [
+        (plan, start, min(start + args.batch_size, args.posts))
+        for start in range(0, args.posts, args.batch_size)
+    ]
+    if args.workers > 1:
+        with multiprocessing.Pool(args.workers, initializer=_init_worker) as pool:
+            results = pool.imap_unordered(_run_chunk, tasks)
+            for result in results:
+                for key, value in result.items():
+                    totals[key] += value
+                print(f"已写入 {totals['posts']} / {args.posts} 条帖子")
+    else:
+        for task in tasks:
+            for key, value in _run_chunk(task).items():
+                totals[key] += value
+            print(f"已写入 {totals['posts']} / {args.posts} 条帖子")
+
+    if args.articles:
+        insert_articles(args.articles, args.seed, args.batch_size, plan.now)
+        # 索引行数与文章数不一致时 setup 会重建检索索引
+        get_search_backend().setup(engine)
+        print(f"已写入 {args.articles} 篇健康文章，并更新检索索引")
+
+    elapsed = time.perf_counter() - started
+    rows = args.users + sum(totals.values()) + args.articles
+    print(
+        f"完成：帖子 {totals['posts']}，标签 {totals['post_tags']}，评论 {totals['comments']}，"
+        f"点赞 {totals['likes']}，用时 {elapsed:.1f} 秒（{rows / elapsed:,.0f} 行/秒）"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+从 NDJSON 文件批量导入健康文章（每行一个 JSON 对象，字段同 POST /health/articles）。
+
+逐行解析并校验，每 --batch-size 篇文章一次批量插入、一个事务，同时写入全文索引；
+格式错误或校验失败的行会被跳过并在最后列出行号，不会中断导入。
+接口 POST /api/v1/health/articles/import 使用同样的逻辑。
+
+用法：
+    python scripts/import_articles.py articles.ndjson --batch-size 1000
+    cat articles.ndjson | python scripts/import_articles.py -
+"""
+import argparse
+import os
+import sys
+import time
+
+# 获取项目根目录
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root_dir)
+
+from app.config import settings
+from app.database.base import SessionLocal, engine
+from app.database.schema import init_database
+from app.health.importer import ArticleImport, LineSplitter
+
+def main():
+    parser = argparse.ArgumentParser(description="Import health articles from NDJSON")
+    parser.add_argument("path", help="NDJSON file, or - for stdin")
+    parser.add_argument("--batch-size", type=int, default=settings.ARTICLE_IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    init_database(engine)
+    job = ArticleImport(batch_size=args.batch_size, max_errors=sys.maxsize)
+    splitter = LineSplitter()
+    source = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+    db = SessionLocal()
+    start = time.perf_counter()
+    try:
+        while chunk := source.read(1024 * 1024):
+            for line in splitter.feed(chunk):
+                if job.add(line) and job.insert(db):
+                    print(f"已导入 {job.inserted} 篇（读取到第 {job.line_no} 行）")
+        for line in splitter.close():
+            job.add(line)
+        job.insert(db)
+    finally:
+        db.close()
+        if source is not sys.stdin.buffer:
+            source.close()
+
+    for error in job.errors:
+        print(f"第 {error.line} 行：{error.error}")
+    print(f"导入完成：成功 {job.inserted} 篇，失败 {job.failed} 行，用时 {time.perf_counter() - start:.1f} 秒")
+    if job.failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""
+初始化数据库：创建缺失的表和索引，以及全文检索索引。
+
+应用在 DB_CREATE_SCHEMA_ON_STARTUP=true（默认）时会在启动阶段自动执行同样的
+操作；生产环境建议关闭该设置，在部署时单独运行本脚本，避免每个 worker
+启动时都访问数据库。
+
+用法：
+    python scripts/init_db.py
+"""
+import os
+import sys
+import time
+
+# 获取项目根目录
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root_dir)
+
+from app.database.base import engine
+from app.database.schema import init_database
+
+def main():
+    start = time.perf_counter()
+    init_database(engine)
+    print(f"数据库初始化完成（{engine.url.render_as_string(hide_password=True)}），"
+          f"用时 {time.perf_counter() - start:.2f} 秒。")
+
+if __name__ == "__main__":
+    main()
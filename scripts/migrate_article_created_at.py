@@ -0,0 +1,115 @@
+"""
+迁移 health_articles.created_at：从 ISO 字符串（String(50)）转为 DateTime，
+并创建 (category, created_at) 与 (created_at, id) 复合索引。
+
+按 id 分批处理，每批一个短事务，批次之间可以暂停，避免长时间锁表；
+可以重复执行，已转换的行会被跳过。
+
+- SQLite：DateTime 本身以文本存储，只需把各种 ISO 写法统一改写成
+  SQLAlchemy 的存储格式（否则 "T" 与空格分隔的值混排时排序错误）。
+- 其他数据库：新增 created_at_new 列分批回填，最后在一个短事务里
+  删除旧列并把新列改名为 created_at。
+
+用法：
+    python scripts/migrate_article_created_at.py [--batch-size 1000] [--pause 0.05]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Optional
+
+# 获取项目根目录
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root_dir)
+
+from sqlalchemy import DateTime, bindparam, column, inspect, table, text, update
+
+from app.database.base import engine, is_sqlite
+from app.health.models import HealthArticle
+
+def parse_timestamp(value) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).strip().replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        print(f"无法解析的时间：{value!r}，已置为空")
+        return None
+
+def backfill(source: str, target: str, batch_size: int, pause: float) -> int:
+    # 读原始文本，按 DateTime 绑定写回，由方言决定最终的存储格式
+    name = HealthArticle.__tablename__
+    articles = table(name, column("id"), column(target, DateTime))
+    to_stored = DateTime().dialect_impl(engine.dialect).bind_processor(engine.dialect)
+    last_id = 0
+    converted = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text(f"SELECT id, {source} AS value FROM {name} WHERE id > :last_id ORDER BY id LIMIT :limit"),
+                {"last_id": last_id, "limit": batch_size},
+            ).all()
+            if not rows:
+                break
+            changed = []
+            for row in rows:
+                value = parse_timestamp(row.value)
+                # 原地转换时，已是存储格式的行无需改写
+                if source == target and to_stored is not None and value is not None \
+                        and to_stored(value) == row.value:
+                    continue
+                changed.append({"article_id": row.id, "value": value})
+            if changed:
+                conn.execute(
+                    update(articles)
+                    .where(articles.c.id == bindparam("article_id"))
+                    .values({target: bindparam("value")}),
+                    changed,
+                )
+        last_id = rows[-1].id
+        converted += len(changed)
+        print(f"已处理到 id {last_id}，本批转换 {len(changed)} 行")
+        if pause:
+            time.sleep(pause)
+    return converted
+
+def create_indexes():
+    for index in HealthArticle.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+def migrate(batch_size: int, pause: float) -> int:
+    columns = {column["name"]: column for column in inspect(engine).get_columns(HealthArticle.__tablename__)}
+    if is_sqlite(str(engine.url)):
+        converted = backfill("created_at", "created_at", batch_size, pause)
+    elif isinstance(columns["created_at"]["type"], DateTime):
+        print("created_at 已经是 DateTime 类型，跳过转换")
+        converted = 0
+    else:
+        if "created_at_new" not in columns:
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {HealthArticle.__tablename__} ADD COLUMN created_at_new TIMESTAMP"))
+        converted = backfill("created_at", "created_at_new", batch_size, pause)
+        with engine.begin() as conn:
+            # 切换前补上回填期间新写入的行
+            conn.execute(
+                text(f"UPDATE {HealthArticle.__tablename__} SET created_at_new = CAST(created_at AS TIMESTAMP) "
+                     "WHERE created_at_new IS NULL AND created_at IS NOT NULL")
+            )
+            conn.execute(text(f"ALTER TABLE {HealthArticle.__tablename__} DROP COLUMN created_at"))
+            conn.execute(text(f"ALTER TABLE {HealthArticle.__tablename__} RENAME COLUMN created_at_new TO created_at"))
+    create_indexes()
+    return converted
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert health_articles.created_at to DateTime")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--pause", type=float, default=0.05, help="Seconds to sleep between batches")
+    args = parser.parse_args()
+
+    converted = migrate(args.batch_size, args.pause)
+    print(f"迁移完成，共转换 {converted} 行，索引已创建。")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+重建健康文章全文索引（SEARCH_BACKEND 指定的后端）。
+
+在绕过 API 直接写入 health_articles 之后执行，例如 create_test_data.py。
+
+用法：
+    python scripts/rebuild_search_index.py
+"""
+import os
+import sys
+
+# 获取项目根目录
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root_dir)
+
+from app.database.base import Base, SessionLocal, engine
+from app.health import models  # 注册 health_articles 表
+from app.health.search import get_search_backend
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    backend = get_search_backend()
+    backend.setup(engine)
+    db = SessionLocal()
+    try:
+        count = backend.rebuild(db)
+        db.commit()
+        print(f"索引重建完成（{backend.name}），共 {count} 篇文章。")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
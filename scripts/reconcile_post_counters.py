@@ -0,0 +1,45 @@
+"""
+校正帖子计数：根据 post_likes 和 comments 重新计算 posts.likes_count /
+posts.comments_count，修复写回缓冲丢失（进程崩溃）或历史并发造成的偏差。
+
+按 id 区间分批，每批一个短事务。
+
+注意：点赞数采用写回缓冲（LIKE_FLUSH_INTERVAL_SECONDS > 0）时，各 worker 中
+尚未写回的增量已经体现在 post_likes 里，写回后会被重复计入。因此须在 API
+停止（或所有 worker 都设置 LIKE_FLUSH_INTERVAL_SECONDS=0）时运行，
+例如部署维护窗口或进程崩溃后重启之前。
+
+用法：
+    python scripts/reconcile_post_counters.py [--batch-size 5000]
+"""
+import argparse
+import os
+import sys
+
+# 获取项目根目录
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root_dir)
+
+from sqlalchemy import func, select
+
+from app.community.likes import reconcile_counts
+from app.community.models import Post
+from app.database.base import engine
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute post like/comment counters")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        max_id = conn.execute(select(func.max(Post.id))).scalar() or 0
+
+    fixed = 0
+    for start_id in range(1, max_id + 1, args.batch_size):
+        with engine.begin() as conn:
+            fixed += reconcile_counts(conn, start_id, start_id + args.batch_size)
+
+    print(f"计数校正完成，共修正 {fixed} 条帖子。")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""
+计算热帖分数：为旧数据库补上 posts.hot_score 列和索引，然后执行一次完整的
+热度刷新（写入 hot_score 并更新 is_hot）。
+
+应用运行时会按 HOT_REFRESH_SECONDS 自动刷新，本脚本用于升级后的首次回填
+或在关闭自动刷新时由定时任务调用。
+
+用法：
+    python scripts/refresh_hot_scores.py
+"""
+import asyncio
+import os
+import sys
+
+# 获取项目根目录
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root_dir)
+
+from app.community.ranking import hot_ranking
+from app.database.base import engine
+from app.database.schema import init_database
+
+def main():
+    # 补上 hot_score 列和索引（应用启动时也会执行）
+    init_database(engine)
+    asyncio.run(hot_ranking.refresh())
+    print(f"热度刷新完成，排行中共 {len(hot_ranking)} 条帖子。")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+ARTICLES = "/api/v1/health/articles"
+ARTICLE = {"title": "Folic acid", "content": "Take it daily.", "category": "nutrition", "tags": "vitamins", "author": "Dr. Li"}
+
+def _revalidate(client, url, etag, **params):
+    return client.get(url, params=params, headers={"If-None-Match": etag})
+
+def test_article_etag_and_304(client):
+    article_id = client.post(ARTICLES, json=ARTICLE).json()["id"]
+    url = f"{ARTICLES}/{article_id}"
+    first = client.get(url)
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "no-cache"
+    assert client.get(url).headers["ETag"] == etag
+
+    not_modified = _revalidate(client, url, etag)
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert _revalidate(client, url, f'"other", W/{etag}').status_code == 304
+    assert _revalidate(client, url, '"other"').status_code == 200
+
+def test_put_invalidates_article_and_listings(client):
+    article_id = client.post(ARTICLES, json=ARTICLE).json()["id"]
+    url = f"{ARTICLES}/{article_id}"
+    article_etag = client.get(url).headers["ETag"]
+    list_etag = client.get(ARTICLES, params={"category": "nutrition"}).headers["ETag"]
+
+    assert client.put(url, json={**ARTICLE, "title": "Folate"}).status_code == 200
+
+    changed = _revalidate(client, url, article_etag)
+    assert changed.status_code == 200
+    assert changed.json()["title"] == "Folate"
+    assert changed.headers["ETag"] != article_etag
+    listing = _revalidate(client, ARTICLES, list_etag, category="nutrition")
+    assert listing.status_code == 200
+    assert [article["title"] for article in listing.json()["articles"]] == ["Folate"]
+
+def test_create_and_delete_invalidate_listings(client):
+    client.post(ARTICLES, json=ARTICLE)
+    assert client.get(ARTICLES).json()["total"] == 1
+    article_id = client.post(ARTICLES, json=ARTICLE).json()["id"]
+    assert client.get(ARTICLES).json()["total"] == 2
+    client.delete(f"{ARTICLES}/{article_id}")
+    assert client.get(ARTICLES).json()["total"] == 1
+    assert client.get(f"{ARTICLES}/{article_id}").status_code == 404
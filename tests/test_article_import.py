@@ -0,0 +1,41 @@
+import json
+
+from app.health.importer import LineSplitter
+
+ARTICLES = "/api/v1/health/articles"
+
+def _line(title, **fields):
+    article = {"title": title, "content": f"About {title.lower()}.", "category": "nutrition", "tags": "", "author": "Dr. Li"}
+    return json.dumps({**article, **fields}, ensure_ascii=False)
+
+def test_import_reports_bad_lines_and_keeps_going(client):
+    lines = [
+        _line("Folic acid"),
+        "not json",
+        "",
+        json.dumps({"title": "No content"}),
+        _line("叶酸"),
+        _line("Iron"),
+    ]
+    response = client.post(f"{ARTICLES}/import", params={"batch_size": 2}, content="\n".join(lines).encode())
+    result = response.json()
+    assert (result["inserted"], result["failed"]) == (3, 2)
+    assert [error["line"] for error in result["errors"]] == [2, 4]
+    assert "content: Field required" in result["errors"][1]["error"]
+
+    listing = client.get(ARTICLES, params={"sort_by": "title", "sort_desc": False}).json()
+    assert listing["total"] == 3
+    # Imported articles are searchable straight away
+    assert [article["title"] for article in client.get(ARTICLES, params={"search": "叶酸"}).json()["articles"]] == ["叶酸"]
+
+def test_import_streams_chunked_body(client):
+    body = "\n".join(_line(f"Article {i}") for i in range(5)).encode()
+    chunks = (body[i:i + 7] for i in range(0, len(body), 7))
+    result = client.post(f"{ARTICLES}/import", params={"batch_size": 2}, content=chunks).json()
+    assert result == {"inserted": 5, "failed": 0, "errors": []}
+
+def test_splitter_drops_oversized_lines():
+    splitter = LineSplitter(max_bytes=8)
+    assert splitter.feed(b"short\nmuch too long for") == [b"short"]
+    assert splitter.feed(b" the limit\nok") == [None]
+    assert splitter.close() == [b"ok"]
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+
+from app.database.base import engine
+
+ARTICLES = "/api/v1/health/articles"
+
+def _legacy_table(rows):
+    """health_articles as it was before created_at became a DateTime."""
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE health_articles"))
+        conn.execute(text(
+            "CREATE TABLE health_articles (id INTEGER PRIMARY KEY, title VARCHAR(200), content TEXT, "
+            "category VARCHAR(50), tags VARCHAR(200), author VARCHAR(100), created_at VARCHAR(50))"
+        ))
+        conn.execute(
+            text("INSERT INTO health_articles (id, title, content, category, tags, author, created_at) "
+                 "VALUES (:id, :title, '...', 'nutrition', '', 'Dr. Li', :created_at)"),
+            [{"id": i, "title": f"Article {i}", "created_at": created_at} for i, created_at in rows],
+        )
+
+def test_migration_converts_mixed_iso_strings(client, load_script):
+    # Mixed separators sort wrongly as text: ' ' < 'T'
+    _legacy_table([
+        (1, "2024-03-01T08:00:00"),
+        (2, "2024-03-01 09:30:00"),
+        (3, "2024-02-28T23:00:00Z"),
+        (4, "2024-03-01T08:00:00.500000"),
+    ])
+    migrate = load_script("migrate_article_created_at").migrate
+    assert migrate(batch_size=3, pause=0) == 4
+    # Re-running skips rows already in the storage format
+    assert migrate(batch_size=3, pause=0) == 0
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes("health_articles")}
+    assert {"ix_health_articles_category_created_at", "ix_health_articles_created_at_id"} <= indexes
+
+    articles = client.get(ARTICLES, params={"category": "nutrition"}).json()["articles"]
+    assert [article["id"] for article in articles] == [2, 4, 1, 3]
+    assert datetime.fromisoformat(articles[-1]["created_at"]) == datetime(2024, 2, 28, 23, 0)
@@ -0,0 +1,39 @@
+from app.config import settings
+from app.health.cache import article_cache
+
+POSTS = "/api/v1/community/posts"
+ARTICLES = "/api/v1/health/articles"
+ARTICLE = {"title": "Folic acid", "content": "Take it daily.", "category": "nutrition", "tags": "", "author": "Dr. Li"}
+
+def test_post_batch_keeps_request_order(client, auth_headers):
+    headers = auth_headers()
+    a, b = (
+        client.post(POSTS, json={"title": title, "content": "Long enough content"}, headers=headers).json()["id"]
+        for title in ("A", "B")
+    )
+    body = client.get(f"{POSTS}/batch", params={"ids": f"{b},999,{a},{b}"}).json()
+    assert [post and post["id"] for post in body["posts"]] == [b, None, a, b]
+    assert body["not_found"] == [999]
+    assert body["posts"][0]["content"] == "Long enough content"
+
+    summary = client.get(f"{POSTS}/batch", params={"ids": str(a), "view": "summary"}).json()["posts"][0]
+    assert "content" not in summary
+    assert summary["excerpt"] == "Long enough content"
+
+def test_article_batch_fills_and_reuses_cache(client):
+    article_id = client.post(f"{ARTICLES}", json=ARTICLE).json()["id"]
+    url = f"{ARTICLES}/batch"
+    response = client.get(url, params={"ids": f"{article_id},42"})
+    body = response.json()
+    assert body["articles"] == [client.get(f"{ARTICLES}/{article_id}").json(), None]
+    assert body["not_found"] == [42]
+    assert article_cache.get(article_id) is not None
+
+    revalidated = client.get(url, params={"ids": f"{article_id},42"}, headers={"If-None-Match": response.headers["ETag"]})
+    assert revalidated.status_code == 304
+
+def test_batch_rejects_bad_ids(client):
+    too_many = ",".join(str(i) for i in range(1, settings.BATCH_MAX_IDS + 2))
+    for ids in ("", "1,x", too_many):
+        assert client.get(f"{POSTS}/batch", params={"ids": ids}).status_code == 400
+        assert client.get(f"{ARTICLES}/batch", params={"ids": ids}).status_code == 400
@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+from app.community.events import CounterHub, Subscription, counter_hub
+from app.community.router import _subscribe_counts
+from app.community.schemas import PostCounts
+
+POSTS = "/api/v1/community/posts"
+
+def _counts(batch):
+    return sorted((counts.post_id, counts.likes_count, counts.comments_count) for counts in batch)
+
+def test_hub_coalesces_changes_within_a_window():
+    async def scenario():
+        hub = CounterHub(interval=60, max_subscribers=10)
+        hub.start()
+        subscription = hub.subscribe([1, 2])
+        for likes in range(1, 4):
+            hub.publish(1, likes, 0)
+        hub.publish(2, 5, 1)
+        # Nobody watches post 3
+        hub.publish(3, 9, 9)
+        assert await subscription.get(timeout=0) == []
+
+        assert hub.flush() == 2
+        assert _counts(await subscription.get(timeout=0)) == [(1, 3, 0), (2, 5, 1)]
+        await hub.stop()
+        assert subscription.closed
+
+    asyncio.run(scenario())
+
+def test_slow_reader_holds_latest_counts_only():
+    async def scenario():
+        subscription = Subscription([1])
+        for likes in range(100):
+            subscription.put(PostCounts(post_id=1, likes_count=likes, comments_count=0))
+        assert _counts(await subscription.get(timeout=0)) == [(1, 99, 0)]
+
+    asyncio.run(scenario())
+
+def test_hub_limits_subscribers():
+    hub = CounterHub(interval=0, max_subscribers=1)
+    first = hub.subscribe([1])
+    assert hub.subscribe([1]) is None
+    hub.unsubscribe(first)
+    assert hub.subscribe([1]) is not None
+
+def test_like_reaches_open_stream(client, auth_headers):
+    headers = auth_headers()
+    post_id = client.post(POSTS, json={"title": "Post", "content": "..."}, headers=headers).json()["id"]
+    stream = client.portal.call(_subscribe_counts, [post_id]).body_iterator
+
+    def next_event():
+        event = client.portal.call(stream.__anext__)
+        assert event.startswith("event: counts\ndata: ")
+        return json.loads(event.split("data: ", 1)[1])
+
+    assert next_event() == {"post_id": post_id, "likes_count": 0, "comments_count": 0}
+    client.post(f"{POSTS}/{post_id}/like", headers=headers)
+    client.post(f"{POSTS}/{post_id}/comments", json={"content": "Hi", "post_id": post_id}, headers=headers)
+    # End the coalescing window now rather than waiting for it
+    client.portal.call(counter_hub.flush)
+    assert next_event() == {"post_id": post_id, "likes_count": 1, "comments_count": 1}
+    client.portal.call(stream.aclose)
+    assert len(counter_hub) == 0
+
+def test_stream_errors(client, monkeypatch):
+    assert client.get(f"{POSTS}/999/events").status_code == 404
+    monkeypatch.setattr(counter_hub, "max_subscribers", 0)
+    assert client.get(f"{POSTS}/events", params={"ids": "1"}).status_code == 503
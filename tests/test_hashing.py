@@ -0,0 +1,42 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.auth.hashing import HashingPoolFull, PasswordHasher, password_hasher
+
+USER = {"email": "mom@example.com", "username": "mom", "password": "secret123"}
+
+def test_pool_rejects_beyond_workers_and_queue():
+    hasher = PasswordHasher(workers=1, queue_size=1)
+    release = threading.Event()
+
+    async def scenario():
+        # One hash running, one queued behind it
+        held = [asyncio.ensure_future(hasher._submit(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(HashingPoolFull):
+            await hasher._submit(release.wait)
+        release.set()
+        await asyncio.gather(*held)
+
+    asyncio.run(scenario())
+    hasher.shutdown()
+    stats = hasher.stats()
+    assert (stats["completed"], stats["rejected"], stats["in_flight"]) == (2, 1, 0)
+
+def test_auth_routes_answer_503_when_pool_is_full(client, monkeypatch):
+    assert client.post("/api/v1/auth/register", json=USER).status_code == 200
+    rejected = password_hasher.rejected
+    # No worker or queue slot left, so every hash is turned away up front
+    monkeypatch.setattr(password_hasher, "workers", 0)
+    monkeypatch.setattr(password_hasher, "queue_size", 0)
+    requests = (
+        ("register", {**USER, "email": "dad@example.com", "username": "dad"}),
+        ("login", {"email": USER["email"], "password": USER["password"]}),
+    )
+    for path, body in requests:
+        response = client.post(f"/api/v1/auth/{path}", json=body)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+    assert password_hasher.rejected == rejected + 2
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from app.community.likes import like_counter
+from app.community.models import Post
+from app.community.ranking import HotRanking, hot_ranking
+from app.config import settings
+from app.database.base import engine
+
+POSTS = "/api/v1/community/posts"
+
+def _create_post(client, headers):
+    return client.post(POSTS, json={"title": "Post", "content": "..."}, headers=headers).json()["id"]
+
+def _like(client, post_id, headers):
+    assert client.post(f"{POSTS}/{post_id}/like", headers=headers).status_code == 200
+
+def _hot(client, **params):
+    return [post["id"] for post in client.get(POSTS, params={"sort": "hot", **params}).json()["posts"]]
+
+def _refresh(client, write=True):
+    # The refresh reads flushed like counts
+    client.portal.call(like_counter.flush)
+    client.portal.call(hot_ranking.refresh, write)
+
+def _stored(post_id):
+    with engine.connect() as conn:
+        return conn.execute(select(Post.hot_score, Post.is_hot).where(Post.id == post_id)).one()
+
+def test_hot_feed_orders_by_engagement(client, auth_headers):
+    headers = auth_headers()
+    a, b, c, d = (_create_post(client, headers) for _ in range(4))
+    fans = [auth_headers(f"fan{i}@example.com") for i in range(3)]
+    for fan in fans:
+        _like(client, c, fan)
+    _like(client, b, fans[0])
+    # A comment weighs two likes
+    client.post(f"{POSTS}/{a}/comments", json={"content": "Same here", "post_id": a}, headers=headers)
+    _refresh(client)
+
+    assert _hot(client, page_size=2) + _hot(client, page_size=2, page=2) == [c, a, b, d]
+    posts = client.get(POSTS, params={"sort": "hot"}).json()["posts"]
+    assert [(post["id"], post["is_hot"]) for post in posts] == [(c, True), (a, True), (b, True), (d, False)]
+
+def test_likes_rerank_between_refreshes(client, auth_headers):
+    headers = auth_headers()
+    a, b = (_create_post(client, headers) for _ in range(2))
+    fans = [auth_headers(f"fan{i}@example.com") for i in range(2)]
+    _like(client, a, fans[0])
+    _refresh(client)
+    assert _hot(client, page_size=2) == [a, b]
+
+    for fan in fans:
+        _like(client, b, fan)
+    assert _hot(client, page_size=2) == [b, a]
+
+def test_reader_ranks_without_writing(client, auth_headers):
+    headers = auth_headers()
+    post_id = _create_post(client, headers)
+    _like(client, post_id, headers)
+    _refresh(client, write=False)
+    assert _hot(client) == [post_id]
+    assert tuple(_stored(post_id)) == (0, False)
+
+def test_writer_skips_scores_within_tolerance(client, auth_headers):
+    headers = auth_headers()
+    a, b = (_create_post(client, headers) for _ in range(2))
+    for post_id in (a, b):
+        _like(client, post_id, headers)
+    _refresh(client)
+    score = _stored(a).hot_score
+    assert score > 0
+    with engine.begin() as conn:
+        conn.execute(update(Post).where(Post.id == a).values(hot_score=score * (1 + settings.HOT_SCORE_WRITE_TOLERANCE / 2)))
+        conn.execute(update(Post).where(Post.id == b).values(hot_score=score * 2))
+
+    _refresh(client)
+    assert _stored(a).hot_score == score * (1 + settings.HOT_SCORE_WRITE_TOLERANCE / 2)
+    assert _stored(b).hot_score == pytest.approx(score, rel=0.01)
+
+def test_new_posts_join_the_hot_feed_before_a_refresh(client, auth_headers):
+    headers = auth_headers()
+    a = _create_post(client, headers)
+    _like(client, a, headers)
+    _refresh(client)
+    b = _create_post(client, headers)
+    assert _hot(client) == [a, b]
+
+def test_hot_feed_continues_past_the_ranking(client, auth_headers):
+    headers = auth_headers()
+    old_a, old_b, a, b = (_create_post(client, headers) for _ in range(4))
+    _like(client, a, headers)
+    with engine.begin() as conn:
+        conn.execute(
+            update(Post).where(Post.id.in_([old_a, old_b]))
+            .values(created_at=datetime.utcnow() - timedelta(hours=settings.HOT_WINDOW_HOURS + 1))
+        )
+    _refresh(client)
+    # A stale stored score must not pull a ranked post into the tail again
+    with engine.begin() as conn:
+        conn.execute(update(Post).where(Post.id == b).values(hot_score=100))
+
+    pages = [client.get(POSTS, params={"sort": "hot", "page_size": 3, "page": page}).json() for page in (1, 2)]
+    assert [post["id"] for body in pages for post in body["posts"]] == [a, b, old_b, old_a]
+    assert pages[0]["total"] == 4
+    assert _hot(client, page=3, page_size=2) == []
+
+def test_one_writer_per_lock_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "HOT_RANKING_ROLE", "auto")
+    monkeypatch.setattr(settings, "HOT_RANKING_LOCK_FILE", str(tmp_path / "hot_ranking.lock"))
+    first, second = (HotRanking(size=10, window_hours=1, refresh_seconds=0, hot_count=1) for _ in range(2))
+    assert first._acquire_writer()
+    assert not second._acquire_writer()
+    # The next refresh of another worker takes over once the writer exits
+    first._release_writer()
+    assert second._acquire_writer()
+    second._release_writer()
@@ -0,0 +1,39 @@
+POSTS = "/api/v1/community/posts"
+
+def _liked(client, headers=None, **params):
+    posts = client.get(POSTS, params=params, headers=headers).json()["posts"]
+    return {post["id"]: post["liked_by_me"] for post in posts}
+
+def test_liked_by_me_follows_likes(client, auth_headers):
+    author = auth_headers()
+    fan = auth_headers("fan@example.com")
+    a, b = (client.post(POSTS, json={"title": "Post", "content": "..."}, headers=author).json()["id"] for _ in range(2))
+
+    assert _liked(client, fan) == {a: False, b: False}
+    assert client.post(f"{POSTS}/{a}/like", headers=fan).json()["liked"] is True
+    assert _liked(client, fan) == {a: True, b: False}
+    assert _liked(client, author) == {a: False, b: False}
+    assert client.get(f"{POSTS}/{a}", headers=fan).json()["liked_by_me"] is True
+    batch = client.get(f"{POSTS}/batch", params={"ids": f"{b},{a}"}, headers=fan).json()["posts"]
+    assert [post["liked_by_me"] for post in batch] == [False, True]
+
+    # Unliking writes through the cache
+    assert client.post(f"{POSTS}/{a}/like", headers=fan).json()["liked"] is False
+    assert _liked(client, fan) == {a: False, b: False}
+
+def test_anonymous_viewers_get_null(client, auth_headers):
+    headers = auth_headers()
+    post_id = client.post(POSTS, json={"title": "Post", "content": "..."}, headers=headers).json()["id"]
+    assert _liked(client) == {post_id: None}
+    assert client.get(f"{POSTS}/{post_id}").json()["liked_by_me"] is None
+
+def test_invalid_token_reads_as_anonymous(client, auth_headers):
+    headers = auth_headers()
+    post_id = client.post(POSTS, json={"title": "Post", "content": "..."}, headers=headers).json()["id"]
+    bad = {"Authorization": "Bearer not-a-token"}
+    assert _liked(client, bad) == {post_id: None}
+    response = client.get(f"{POSTS}/{post_id}", headers=bad)
+    assert response.status_code == 200
+    assert response.json()["liked_by_me"] is None
+    # Writes still need a valid token
+    assert client.post(f"{POSTS}/{post_id}/like", headers=bad).status_code == 401
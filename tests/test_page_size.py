@@ -0,0 +1,41 @@
+from app.config import settings
+
+POSTS = "/api/v1/community/posts"
+ARTICLES = "/api/v1/health/articles"
+
+def test_post_page_size_is_capped(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_PAGE_SIZE", 2)
+    headers = auth_headers()
+    for i in range(3):
+        client.post(POSTS, json={"title": f"Post {i}", "content": "..."}, headers=headers)
+    response = client.get(POSTS, params={"page_size": 1000})
+    assert response.status_code == 200
+    assert len(response.json()["posts"]) == 2
+
+def test_comment_and_article_limits_are_capped(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_PAGE_SIZE", 2)
+    headers = auth_headers()
+    post_id = client.post(POSTS, json={"title": "Post", "content": "..."}, headers=headers).json()["id"]
+    for i in range(3):
+        client.post(f"{POSTS}/{post_id}/comments", json={"content": f"Comment {i}", "post_id": post_id}, headers=headers)
+        article = {"title": f"Article {i}", "content": "...", "category": "tips", "tags": "", "author": "Dr. Li"}
+        assert client.post(ARTICLES, json=article).status_code == 200
+
+    response = client.get(f"{POSTS}/{post_id}/comments", params={"page_size": 1000})
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert len(client.get(f"{POSTS}/{post_id}/comments", params={"page": 0, "page_size": 0}).json()) == 1
+    response = client.get(ARTICLES, params={"limit": 1000})
+    assert response.status_code == 200
+    assert len(response.json()["articles"]) == 2
+    assert client.get(ARTICLES, params={"limit": -1}).json()["articles"] == []
+
+def test_post_paging_is_clamped_from_below(client, auth_headers):
+    headers = auth_headers()
+    for i in range(3):
+        client.post(POSTS, json={"title": f"Post {i}", "content": "..."}, headers=headers)
+    # SQLite reads LIMIT -1 as no limit, and page 0 would be a negative offset
+    for params, expected in (({"page_size": -1}, 1), ({"page_size": 0}, 1), ({"page": 0, "page_size": 2}, 2)):
+        response = client.get(POSTS, params=params)
+        assert response.status_code == 200
+        assert len(response.json()["posts"]) == expected
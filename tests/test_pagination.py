@@ -0,0 +1,66 @@
+from datetime import datetime
+
+from sqlalchemy import update
+
+from app.community.models import Comment, Post
+from app.database.base import engine
+
+POSTS = "/api/v1/community/posts"
+
+def _walk(fetch, on_first_page=None):
+    """Follow cursors until the last page; ids in the order they were served."""
+    seen, cursor = [], None
+    while True:
+        ids, cursor = fetch(cursor)
+        if not seen and on_first_page:
+            on_first_page()
+        seen += ids
+        if cursor is None:
+            return seen
+
+def _backdate(model, ids):
+    # Rows sharing a created_at: only the id tiebreaker keeps their order stable
+    with engine.begin() as conn:
+        conn.execute(update(model).where(model.id.in_(ids)).values(created_at=datetime(2024, 1, 1)))
+
+def test_post_cursor_pages_have_no_repeats_or_gaps(client, auth_headers):
+    headers = auth_headers()
+    ids = [
+        client.post(POSTS, json={"title": f"Post {i}", "content": "..."}, headers=headers).json()["id"]
+        for i in range(7)
+    ]
+    _backdate(Post, ids[2:6])
+
+    def fetch(cursor):
+        params = {"page_size": 3, **({"after": cursor} if cursor else {})}
+        body = client.get(POSTS, params=params).json()
+        return [post["id"] for post in body["posts"]], body["next_cursor"]
+
+    def new_post():
+        # Would shift every later offset page by one
+        client.post(POSTS, json={"title": "Late", "content": "..."}, headers=headers)
+
+    assert _walk(fetch, new_post) == [ids[6], ids[1], ids[0], ids[5], ids[4], ids[3], ids[2]]
+
+def test_comment_cursor_pages_have_no_repeats_or_gaps(client, auth_headers):
+    headers = auth_headers()
+    post_id = client.post(POSTS, json={"title": "Post", "content": "..."}, headers=headers).json()["id"]
+    url = f"{POSTS}/{post_id}/comments"
+    ids = [
+        client.post(url, json={"content": f"Comment {i}", "post_id": post_id}, headers=headers).json()["id"]
+        for i in range(5)
+    ]
+    _backdate(Comment, ids[:3])
+
+    def fetch(cursor):
+        response = client.get(url, params={"page_size": 2, **({"after": cursor} if cursor else {})})
+        return [comment["id"] for comment in response.json()], response.headers.get("X-Next-Cursor")
+
+    assert _walk(fetch) == [ids[4], ids[3], ids[2], ids[1], ids[0]]
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get(POSTS, params={"after": "not-a-cursor"}).status_code == 400
+
+def test_cursor_header_is_exposed_to_browsers(client):
+    response = client.get(POSTS, headers={"Origin": "https://app.example.com"})
+    assert "X-Next-Cursor" in response.headers["Access-Control-Expose-Headers"]
@@ -0,0 +1,41 @@
+from sqlalchemy import delete, func, select
+
+from app.community.models import PostTag
+from app.database.base import engine
+
+POSTS = "/api/v1/community/posts"
+
+def _create(client, headers, tags):
+    body = {"title": "Post", "content": "...", "tags": tags}
+    return client.post(POSTS, json=body, headers=headers).json()
+
+def _tagged(client, tag):
+    return sorted(post["id"] for post in client.get(POSTS, params={"tag": tag}).json()["posts"])
+
+def test_tag_filter_matches_whole_tags_only(client, auth_headers):
+    headers = auth_headers()
+    pregnancy = _create(client, headers, ["孕期", "营养"])["id"]
+    early = _create(client, headers, ["孕早期"])["id"]
+    padded = _create(client, headers, [" 孕期 ", "孕期", ""])
+    assert padded["tags"] == ["孕期"]
+
+    assert _tagged(client, "孕期") == sorted([pregnancy, padded["id"]])
+    assert _tagged(client, "孕早期") == [early]
+    # The old LIKE '%期%' filter matched every tag containing the character
+    assert _tagged(client, "期") == []
+    assert _tagged(client, "孕") == []
+
+def test_backfill_rebuilds_post_tags(client, auth_headers, load_script):
+    headers = auth_headers()
+    post_id = _create(client, headers, ["睡眠", "运动"])["id"]
+    with engine.begin() as conn:
+        conn.execute(delete(PostTag))
+    assert _tagged(client, "睡眠") == []
+
+    backfill = load_script("backfill_post_tags").backfill
+    # Twice, to check re-runs don't duplicate rows
+    assert backfill(batch_size=1) == 1
+    assert backfill(batch_size=1) == 1
+    assert _tagged(client, "睡眠") == [post_id]
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(PostTag)).scalar() == 2
@@ -0,0 +1,60 @@
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import update
+
+from app.auth.models import User
+from app.auth.principal import principal_cache
+from app.config import settings
+from app.database.base import SessionLocal, engine
+
+POSTS = "/api/v1/community/posts"
+POST = {"title": "Hello", "content": "First post"}
+
+def _update_user(current_email: str, **values):
+    # Through the ORM, as an admin tool or profile update would
+    with SessionLocal() as db:
+        user = db.query(User).filter(User.email == current_email).one()
+        for name, value in values.items():
+            setattr(user, name, value)
+        db.commit()
+
+def test_repeat_requests_use_cached_principal(client, auth_headers):
+    headers = auth_headers()
+    assert client.post(POSTS, json=POST, headers=headers).status_code == 200
+    hits = principal_cache.hits
+    assert client.post(POSTS, json=POST, headers=headers).status_code == 200
+    assert principal_cache.hits == hits + 1
+
+def test_password_change_revokes_cached_principal(client, auth_headers):
+    headers = auth_headers()
+    assert client.post(POSTS, json=POST, headers=headers).status_code == 200
+    _update_user("mom@example.com", hashed_password="changed")
+    assert client.post(POSTS, json=POST, headers=headers).status_code == 401
+
+def test_deactivation_revokes_cached_principal(client, auth_headers):
+    headers = auth_headers()
+    assert client.post(POSTS, json=POST, headers=headers).status_code == 200
+    _update_user("mom@example.com", is_active=False)
+    assert client.post(POSTS, json=POST, headers=headers).status_code == 401
+
+def test_email_change_needs_a_new_token(client, auth_headers):
+    old = auth_headers()
+    _update_user("mom@example.com", email="mother@example.com")
+    assert client.post(POSTS, json=POST, headers=old).status_code == 401
+    response = client.post("/api/v1/auth/login", json={"email": "mother@example.com", "password": "secret123"})
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    assert client.post(POSTS, json=POST, headers=headers).status_code == 200
+
+def test_revocation_elsewhere_applies_within_the_ttl(client, auth_headers, monkeypatch):
+    headers = auth_headers()
+    assert client.post(POSTS, json=POST, headers=headers).status_code == 200
+    # Like another worker changing the password: this process's cache isn't told
+    with engine.begin() as conn:
+        conn.execute(update(User).where(User.email == "mom@example.com").values(hashed_password="changed"))
+    assert client.post(POSTS, json=POST, headers=headers).status_code == 200
+
+    # Only the cache's clock moves on, not the event loop's
+    later = time.monotonic() + settings.USER_CACHE_TTL_SECONDS + 1
+    monkeypatch.setattr("app.cache.time", SimpleNamespace(monotonic=lambda: later))
+    assert client.post(POSTS, json=POST, headers=headers).status_code == 401
@@ -0,0 +1,78 @@
+import logging
+import threading
+
+import pytest
+from sqlalchemy import func, select, text
+
+from app.auth.principal import principal_cache
+from app.community.models import Post
+from app.community.router import create_post, list_posts
+from app.config import settings
+from app.database.base import engine
+from app.metrics import QueryBudgetExceeded, count_queries
+
+POSTS = "/api/v1/community/posts"
+POST = {"title": "Morning sickness", "content": "Ginger tea helps", "tags": ["t1", "t2", "t3", "t4", "t5"]}
+
+def test_assert_max_queries_trips(query_budget):
+    with pytest.raises(QueryBudgetExceeded) as info:
+        with query_budget(1):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+    assert info.value.stats.queries == 2
+    assert "SELECT 2" in str(info.value)
+
+def test_endpoint_over_budget_raises(client, monkeypatch):
+    # The listing runs a COUNT and a SELECT
+    monkeypatch.setattr(list_posts, "query_budget", 1)
+    with pytest.raises(QueryBudgetExceeded) as info:
+        client.get(POSTS)
+    assert info.value.budget == 1
+
+def test_log_mode_only_warns(client, monkeypatch, caplog):
+    monkeypatch.setattr(list_posts, "query_budget", 1)
+    monkeypatch.setattr(settings, "QUERY_BUDGET_MODE", "log")
+    with caplog.at_level(logging.WARNING, logger="app.metrics"):
+        assert client.get(POSTS).status_code == 200
+    assert "Query budget exceeded: GET /api/v1/community/posts ran 2 statements, budget is 1" in caplog.text
+
+def test_create_post_within_budget_for_many_tags(client, auth_headers):
+    headers = auth_headers()
+    # A cold principal cache costs the user lookup too
+    principal_cache.clear()
+    response = client.post(POSTS, json=POST, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["tags"] == POST["tags"]
+
+def test_over_budget_create_post_is_rolled_back(client, auth_headers, monkeypatch):
+    headers = auth_headers()
+    monkeypatch.setattr(create_post, "query_budget", 2)
+    with pytest.raises(QueryBudgetExceeded):
+        client.post(POSTS, json=POST, headers=headers)
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count(Post.id))).scalar() == 0
+
+def test_count_queries_ignores_other_threads(query_counter):
+    # Like the app's background tasks: started outside the counted context
+    def background():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    with count_queries() as counter:
+        worker = threading.Thread(target=background)
+        worker.start()
+        worker.join()
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 2"))
+    assert counter.queries == 1
+    assert query_counter.queries == 1
+
+def test_query_budget_counts_client_requests(client, auth_headers, query_budget):
+    headers = auth_headers()
+    post_id = client.post(POSTS, json=POST, headers=headers).json()["id"]
+    client.post(f"{POSTS}/{post_id}/comments", json={"content": "Same", "post_id": post_id}, headers=headers)
+    # COUNT, page, windowed comments; unaffected by the flusher running meanwhile
+    with query_budget(3) as counter:
+        client.get(POSTS, params={"include": "recent_comments:3"})
+    assert counter.queries == 3
@@ -0,0 +1,44 @@
+from datetime import datetime
+
+from sqlalchemy import update
+
+from app.community.models import Comment
+from app.config import settings
+from app.database.base import engine
+
+POSTS = "/api/v1/community/posts"
+
+def _comment(client, headers, post_id, content):
+    body = {"content": content, "post_id": post_id}
+    return client.post(f"{POSTS}/{post_id}/comments", json=body, headers=headers).json()["id"]
+
+def test_each_post_gets_its_latest_comments(client, auth_headers):
+    headers = auth_headers()
+    busy, quiet, silent = (
+        client.post(POSTS, json={"title": title, "content": "..."}, headers=headers).json()["id"]
+        for title in ("Busy", "Quiet", "Silent")
+    )
+    busy_comments = [_comment(client, headers, busy, f"Comment {i}") for i in range(5)]
+    quiet_comment = _comment(client, headers, quiet, "Only one")
+    # A created_at tie among the latest: broken by id, as in list_comments
+    with engine.begin() as conn:
+        conn.execute(update(Comment).where(Comment.id.in_(busy_comments[3:])).values(created_at=datetime(2030, 1, 1)))
+
+    posts = client.get(POSTS, params={"include": "recent_comments:3"}).json()["posts"]
+    recent = {post["id"]: [comment["id"] for comment in post["recent_comments"]] for post in posts}
+    assert recent == {
+        busy: [busy_comments[4], busy_comments[3], busy_comments[2]],
+        quiet: [quiet_comment],
+        silent: [],
+    }
+    listed = client.get(f"{POSTS}/{busy}/comments", params={"page_size": 3}).json()
+    assert [comment["id"] for comment in listed] == recent[busy]
+
+    detail = client.get(f"{POSTS}/{busy}", params={"include": "recent_comments"}).json()
+    assert len(detail["recent_comments"]) == settings.RECENT_COMMENTS_DEFAULT
+    assert client.get(f"{POSTS}/{busy}").json()["recent_comments"] is None
+
+def test_include_is_validated(client):
+    too_many = f"recent_comments:{settings.RECENT_COMMENTS_MAX + 1}"
+    for include in ("author", "recent_comments:x", "recent_comments:0", too_many):
+        assert client.get(POSTS, params={"include": include}).status_code == 400
@@ -0,0 +1,26 @@
+from sqlalchemy import inspect, text
+
+from app.database.base import engine
+from app.database.schema import LATER_INDEXES, init_database
+
+def _indexes(table):
+    return {index["name"] for index in inspect(engine).get_indexes(table)}
+
+def test_init_database_adds_later_indexes_to_existing_tables(client):
+    # A database created before these indexes: the tables exist, the indexes don't
+    with engine.begin() as conn:
+        for _, name in LATER_INDEXES:
+            conn.execute(text(f"DROP INDEX {name}"))
+    init_database()
+    for table, name in LATER_INDEXES:
+        assert name in _indexes(table)
+    # Idempotent
+    init_database()
+
+def test_init_database_adds_hot_score_to_existing_posts(client):
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_posts_hot_score"))
+        conn.execute(text("ALTER TABLE posts DROP COLUMN hot_score"))
+    init_database()
+    assert "hot_score" in {column["name"] for column in inspect(engine).get_columns("posts")}
+    assert "ix_posts_hot_score" in _indexes("posts")
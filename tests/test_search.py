@@ -0,0 +1,52 @@
+ARTICLES = "/api/v1/health/articles"
+
+def _create(client, title, content, category="nutrition"):
+    article = {"title": title, "content": content, "category": category, "tags": "", "author": "Dr. Li"}
+    return client.post(ARTICLES, json=article).json()["id"]
+
+def _search(client, query, **params):
+    return client.get(ARTICLES, params={"search": query, **params}).json()
+
+def _ids(result):
+    return [article["id"] for article in result["articles"]]
+
+def test_search_ranks_title_hits_first(client):
+    in_content = _create(client, "Daily walks", "Walk daily and take folic acid with breakfast.")
+    in_title = _create(client, "Folic acid basics", "What to take before and during pregnancy.")
+    _create(client, "Sleep", "Lie on your left side.")
+
+    result = _search(client, "folic")
+    assert _ids(result) == [in_title, in_content]
+    assert result["total"] == 2
+    assert "<mark>folic</mark>" in result["articles"][1]["snippet"].lower()
+
+def test_chinese_queries_match_as_phrases(client):
+    phrase = _create(client, "孕期营养", "孕早期要补充叶酸。")
+    # Both characters, but not next to each other
+    scattered = _create(client, "水果", "叶子菜和酸奶都可以吃。")
+
+    assert _ids(_search(client, "叶酸")) == [phrase]
+    assert sorted(_ids(_search(client, "酸"))) == sorted([phrase, scattered])
+    assert "<mark>叶酸</mark>" in _search(client, "叶酸")["articles"][0]["snippet"]
+
+def test_index_follows_updates_and_deletes(client):
+    article_id = _create(client, "Morning sickness", "Ginger tea helps.")
+    update = {"title": "Nausea", "content": "Crackers help.", "category": "nutrition", "tags": "", "author": "Dr. Li"}
+    assert client.put(f"{ARTICLES}/{article_id}", json=update).status_code == 200
+    assert _ids(_search(client, "ginger")) == []
+    assert _ids(_search(client, "crackers")) == [article_id]
+
+    assert client.delete(f"{ARTICLES}/{article_id}").status_code == 200
+    assert _search(client, "crackers") == {"articles": [], "total": 0}
+
+def test_search_respects_category(client):
+    _create(client, "Folic acid", "Take it daily.", category="nutrition")
+    other = _create(client, "Folic acid and exercise", "Take it daily.", category="exercise")
+    assert _ids(_search(client, "folic", category="exercise")) == [other]
+
+def test_snippets_escape_article_markup(client):
+    _create(client, "Folic acid <b>basics</b>", "Take folic acid daily <script>alert(1)</script> & rest.")
+    snippet = _search(client, "folic")["articles"][0]["snippet"]
+    assert "<mark>folic</mark>" in snippet.lower()
+    assert "<script>" not in snippet
+    assert "&lt;script&gt;alert(1)&lt;/script&gt; &amp; rest." in snippet